@@ -0,0 +1,121 @@
+"""
+正文缓存模块
+使用SQLite持久化已提取的新闻正文，按规范化URL索引，支持TTL过期和LRU淘汰
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from url_utils import canonicalize_url
+
+
+class ArticleCache:
+    """新闻正文缓存（SQLite）"""
+
+    def __init__(self, db_path: str, ttl_seconds: float, max_entries: int):
+        """
+        Args:
+            db_path: SQLite数据库文件路径
+            ttl_seconds: 缓存有效期（秒）
+            max_entries: 最多保留的条目数，超出时按最近访问时间淘汰
+        """
+        self.logger = logging.getLogger(__name__)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS articles (
+                    url TEXT PRIMARY KEY,
+                    content TEXT NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_articles_last_access ON articles(last_access)"
+            )
+
+    def get(self, url: str) -> Optional[str]:
+        """
+        读取缓存的正文
+
+        Returns:
+            未过期的正文文本，未命中返回None
+        """
+        key = canonicalize_url(url)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content, fetched_at FROM articles WHERE url = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            content, fetched_at = row
+            with self._conn:
+                if now - fetched_at > self.ttl_seconds:
+                    self._conn.execute("DELETE FROM articles WHERE url = ?", (key,))
+                    return None
+                self._conn.execute(
+                    "UPDATE articles SET last_access = ? WHERE url = ?", (now, key)
+                )
+        return content
+
+    def put(self, url: str, content: str) -> None:
+        """
+        写入正文并在超出容量时淘汰最久未访问的条目
+        """
+        if not content:
+            return
+
+        key = canonicalize_url(url)
+        now = time.time()
+        content_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO articles (url, content, content_hash, fetched_at, last_access)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (key, content, content_hash, now, now)
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        """
+        删除过期条目，并按LRU淘汰超出容量的条目（需在持有锁时调用）
+        """
+        self._conn.execute(
+            "DELETE FROM articles WHERE fetched_at < ?", (time.time() - self.ttl_seconds,)
+        )
+        count = self._conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                """
+                DELETE FROM articles WHERE url IN (
+                    SELECT url FROM articles ORDER BY last_access ASC LIMIT ?
+                )
+                """,
+                (overflow,)
+            )
+            self.logger.debug(f"正文缓存淘汰 {overflow} 条")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,92 @@
+"""
+RSS摘要清理基准：_clean_text快速路径对比每条都构建BeautifulSoup的原实现
+
+用法: python benchmarks/bench_clean_text.py [--count N] [--repeat N]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import warnings
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests"))
+
+import legacy  # noqa: E402
+from helpers import fixture_path, iter_feed_entries, list_fixtures, make_scraper  # noqa: E402
+
+
+def load_summaries():
+    """
+    订阅源夹具中的真实摘要，以及等价性语料中的各种标记
+    """
+    feed_summaries = []
+    for path in list_fixtures("feeds"):
+        for entry in iter_feed_entries(path):
+            summary = legacy.extract_entry_fields(entry)[2]
+            if summary:
+                feed_summaries.append(summary)
+    with open(fixture_path("summaries.jsonl"), encoding="utf-8") as f:
+        corpus = [json.loads(line) for line in f if line.strip()]
+    return feed_summaries, corpus
+
+
+def best_of(func, texts, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for text in texts:
+            func(text)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def count_fallbacks(scraper, texts) -> int:
+    import news_scraper
+
+    original = news_scraper.BeautifulSoup
+    calls = 0
+
+    def counting(*args, **kwargs):
+        nonlocal calls
+        calls += 1
+        return original(*args, **kwargs)
+
+    news_scraper.BeautifulSoup = counting
+    try:
+        for text in texts:
+            scraper._clean_text(text)
+    finally:
+        news_scraper.BeautifulSoup = original
+    return calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=5000, help="摘要条数")
+    parser.add_argument("--repeat", type=int, default=3, help="每组重复次数（取最快一次）")
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore")
+    scraper = make_scraper()
+    feed_summaries, corpus = load_summaries()
+    rng = random.Random(0)
+    workloads = {
+        "feed summaries": [rng.choice(feed_summaries) for _ in range(args.count)],
+        "mixed (20% corpus)": [rng.choice(corpus if rng.random() < 0.2 else feed_summaries)
+                               for _ in range(args.count)],
+    }
+
+    print(f"{'workload':20s} {'count':>6s} {'bs4':>10s} {'fast path':>10s} {'speedup':>8s} {'fallback':>9s}")
+    for name, texts in workloads.items():
+        old = best_of(legacy.clean_text, texts, args.repeat)
+        new = best_of(scraper._clean_text, texts, args.repeat)
+        fallbacks = count_fallbacks(scraper, texts)
+        print(f"{name:20s} {len(texts):6d} {old * 1e3:8.1f}ms {new * 1e3:8.1f}ms {old / new:7.1f}x "
+              f"{fallbacks / len(texts):8.1%}")
+
+
+if __name__ == "__main__":
+    main()
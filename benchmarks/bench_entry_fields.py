@@ -0,0 +1,47 @@
+"""
+RSS/Atom条目字段提取基准：单次遍历的_extract_entry_fields对比原来的三次查找
+
+用法: python benchmarks/bench_entry_fields.py [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests"))
+
+import legacy  # noqa: E402
+from helpers import iter_feed_entries, list_fixtures, make_scraper  # noqa: E402
+
+
+def best_of(func, entries, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for entry in entries:
+            func(entry)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20, help="每组重复次数（取最快一次）")
+    args = parser.parse_args()
+
+    scraper = make_scraper()
+    print(f"{'fixture':24s} {'entries':>7s} {'legacy':>10s} {'single-pass':>12s} {'speedup':>8s}")
+    total_old = total_new = 0.0
+    for path in list_fixtures("feeds"):
+        entries = list(iter_feed_entries(path))
+        old = best_of(legacy.extract_entry_fields, entries, args.repeat)
+        new = best_of(scraper._extract_entry_fields, entries, args.repeat)
+        total_old += old
+        total_new += new
+        print(f"{os.path.basename(path):24s} {len(entries):7d} {old * 1e3:8.2f}ms {new * 1e3:10.2f}ms {old / new:7.1f}x")
+    print(f"{'total':24s} {'':7s} {total_old * 1e3:8.2f}ms {total_new * 1e3:10.2f}ms {total_old / total_new:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+输入清理基准：sanitize_text对比原来逐条re.sub的实现，包含100KB以上的恶意输入
+
+原实现在恶意输入上是多项式回溯（10KB约需十几到几十秒），默认只对不超过
+--legacy-max-chars的恶意输入运行原实现。
+
+用法: python benchmarks/bench_sanitizer.py [--legacy-max-chars N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests"))
+
+import legacy  # noqa: E402
+from helpers import ensure_config, iter_feed_entries, list_fixtures  # noqa: E402
+
+ensure_config()
+
+from sanitizer import sanitize_text  # noqa: E402
+
+SIZES = (10 * 1024, 100 * 1024, 1024 * 1024)
+
+# 会让原正则大量回溯的输入：(前缀, 重复片段)；前缀让规则的全部关键词都出现，预筛不会跳过
+ADVERSARIAL = {
+    "ignore previous": ("instructions ", "ignore previous "),
+    "you are": ("now ", "you are "),
+    "override system": ("prompt ", "override system "),
+    "open comments": ("--> ", "<!-- "),
+    "system: x": ("", "system: x "),
+}
+
+
+def repeat_to(text: str, chars: int) -> str:
+    return (text * (chars // len(text) + 1))[:chars]
+
+
+def article_text() -> str:
+    """
+    订阅源夹具中的标题和摘要拼接成的普通正文
+    """
+    parts = []
+    for path in list_fixtures("feeds"):
+        for entry in iter_feed_entries(path):
+            parts.extend(field for field in legacy.extract_entry_fields(entry) if field)
+    return '\n'.join(parts)
+
+
+def timed(func, text: str) -> float:
+    started = time.perf_counter()
+    func(text, len(text))
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--legacy-max-chars", type=int, default=10 * 1024,
+                        help="恶意输入超过该长度时不运行原实现")
+    args = parser.parse_args()
+
+    workloads = [("article text", repeat_to(article_text(), size), True) for size in SIZES]
+    for name, (prefix, unit) in ADVERSARIAL.items():
+        for size in SIZES:
+            workloads.append((name, prefix + repeat_to(unit, size - len(prefix)), size <= args.legacy_max_chars))
+
+    print(f"{'input':18s} {'size':>8s} {'legacy':>11s} {'new':>9s} {'same':>5s}")
+    for name, text, run_legacy in workloads:
+        new_seconds = timed(sanitize_text, text)
+        if run_legacy:
+            legacy_seconds = timed(legacy.sanitize_input, text)
+            same = sanitize_text(text, len(text)) == legacy.sanitize_input(text, len(text))
+            legacy_column, same_column = f"{legacy_seconds * 1e3:9.1f}ms", str(same)
+        else:
+            legacy_column, same_column = "skipped", "-"
+        print(f"{name:18s} {len(text) // 1024:6d}KB {legacy_column:>11s} {new_seconds * 1e3:7.1f}ms {same_column:>5s}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+SimHash近邻索引基准：多表置换索引对比原来每段一张表的索引（随机指纹，查找后加入）
+
+用法: python benchmarks/bench_simhash_index.py [--max-distance K] [--sizes N ...]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests"))
+
+import legacy  # noqa: E402
+from helpers import ensure_config  # noqa: E402
+
+ensure_config()
+
+from dedup import SIMHASH_BITS, SimHashIndex  # noqa: E402
+
+
+def run(index, fingerprints) -> float:
+    started = time.perf_counter()
+    for fingerprint in fingerprints:
+        if index.find(fingerprint) is None:
+            index.add(fingerprint, fingerprint)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--max-distance", type=int, default=6)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 4000, 16000, 64000])
+    args = parser.parse_args()
+
+    print(f"{'items':>7s} {'legacy':>10s} {'compares':>11s} {'multi-table':>12s} {'compares':>11s} {'tables':>7s}")
+    for size in args.sizes:
+        rng = random.Random(size)
+        fingerprints = [rng.getrandbits(SIMHASH_BITS) for _ in range(size)]
+        old_index = legacy.BandedSimHashIndex(args.max_distance)
+        new_index = SimHashIndex(args.max_distance)
+        old = run(old_index, fingerprints)
+        new = run(new_index, fingerprints)
+        print(f"{size:7d} {old * 1e3:8.1f}ms {old_index.comparisons:11d} {new * 1e3:10.1f}ms "
+              f"{new_index.comparisons:11d} {len(new_index._tables):7d}")
+
+
+if __name__ == "__main__":
+    main()
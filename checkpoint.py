@@ -0,0 +1,109 @@
+"""
+运行检查点模块
+以追加写入的JSONL日志记录每条新闻的抓取结果和AI处理结果，支持中断后续跑
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Tuple
+
+from url_utils import canonicalize_url
+
+
+def news_key(item: Dict) -> str:
+    """
+    生成新闻条目的稳定标识（规范化URL + 标题）
+    """
+    raw = f"{canonicalize_url(item.get('url', ''))}\n{item.get('title', '')}"
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+class RunJournal:
+    """
+    运行日志（追加写入的JSONL文件）
+
+    每行一条记录：{"type": "scraped", "key": ..., "item": {...}} 或
+    {"type": "processed", "key": ..., "result": {...}}。
+    写入后立即flush，每累计fsync_every条或间隔fsync_interval秒执行一次fsync，
+    兼顾持久性和写入开销。
+    """
+
+    def __init__(self, path: str, resume: bool = False, fsync_every: int = 10, fsync_interval: float = 5.0):
+        """
+        Args:
+            path: 日志文件路径
+            resume: True时在已有日志后追加，否则清空重新开始
+            fsync_every: 每写入多少条记录执行一次fsync
+            fsync_interval: 距上次fsync超过多少秒时执行fsync
+        """
+        self.logger = logging.getLogger(__name__)
+        self.path = path
+        self.fsync_every = max(1, fsync_every)
+        self.fsync_interval = fsync_interval
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+        journal_dir = os.path.dirname(path)
+        if journal_dir:
+            os.makedirs(journal_dir, exist_ok=True)
+        self._file = open(path, 'a' if resume else 'w', encoding='utf-8')
+
+    def load(self) -> Tuple[List[Dict], Dict[str, Dict]]:
+        """
+        读取日志中已有的记录（损坏或写了一半的行会被跳过）
+
+        Returns:
+            (已抓取的新闻列表, 新闻标识 -> 处理结果)
+        """
+        scraped: Dict[str, Dict] = {}
+        processed: Dict[str, Dict] = {}
+        if not os.path.exists(self.path):
+            return [], processed
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                key = record.get('key')
+                if record.get('type') == 'scraped' and key:
+                    scraped.setdefault(key, record.get('item') or {})
+                elif record.get('type') == 'processed' and key:
+                    processed[key] = record.get('result') or {}
+
+        self.logger.info(f"读取检查点: 已抓取 {len(scraped)} 条，已处理 {len(processed)} 条 - {self.path}")
+        return list(scraped.values()), processed
+
+    def record_scraped(self, item: Dict) -> None:
+        self._append({'type': 'scraped', 'key': news_key(item), 'item': item})
+
+    def record_processed(self, item: Dict, result: Dict) -> None:
+        self._append({'type': 'processed', 'key': news_key(item), 'result': result})
+
+    def _append(self, record: Dict) -> None:
+        line = json.dumps(record, ensure_ascii=False) + '\n'
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            self._pending += 1
+            if self._pending >= self.fsync_every or time.monotonic() - self._last_sync >= self.fsync_interval:
+                self._sync()
+
+    def _sync(self) -> None:
+        os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.flush()
+            self._sync()
+            self._file.close()
@@ -0,0 +1,97 @@
+"""
+主机熔断模块
+按主机记录连续失败次数，主机持续不可用时让后续请求快速失败
+"""
+
+import logging
+import random
+import threading
+import time
+from typing import Dict
+from urllib.parse import urlparse
+
+import requests
+
+
+class CircuitOpenError(requests.RequestException):
+    """主机处于熔断状态，请求未发送"""
+
+
+class HostCircuitBreaker:
+    """
+    按主机的熔断器
+
+    连续失败达到阈值后熔断，冷却期内该主机的请求直接失败；冷却期结束后
+    放行一个探测请求，成功则恢复，失败则重新熔断。
+    """
+
+    def __init__(self, failure_threshold: int, cooldown_seconds: float):
+        self.logger = logging.getLogger(__name__)
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown_seconds = cooldown_seconds
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, Dict] = {}
+
+    @staticmethod
+    def _host_of(url: str) -> str:
+        return urlparse(url).netloc.lower()
+
+    def _state(self, host: str) -> Dict:
+        state = self._hosts.get(host)
+        if state is None:
+            state = {'failures': 0, 'open_until': 0.0, 'probing': False}
+            self._hosts[host] = state
+        return state
+
+    def before_request(self, url: str) -> None:
+        """
+        请求前检查主机状态
+
+        Raises:
+            CircuitOpenError: 主机处于熔断状态时抛出
+        """
+        host = self._host_of(url)
+        now = time.monotonic()
+        with self._lock:
+            state = self._state(host)
+            if not state['open_until']:
+                return
+            if now < state['open_until']:
+                remaining = state['open_until'] - now
+                raise CircuitOpenError(f"主机已熔断（剩余{remaining:.0f}秒）: {host}")
+            if state['probing']:
+                raise CircuitOpenError(f"主机熔断恢复探测中: {host}")
+            state['probing'] = True
+
+    def record_success(self, url: str) -> None:
+        host = self._host_of(url)
+        with self._lock:
+            state = self._state(host)
+            if state['open_until']:
+                self.logger.info(f"主机恢复正常，解除熔断: {host}")
+            state.update(failures=0, open_until=0.0, probing=False)
+
+    def record_failure(self, url: str) -> None:
+        host = self._host_of(url)
+        with self._lock:
+            state = self._state(host)
+            state['failures'] += 1
+            if state['probing'] or state['failures'] >= self.failure_threshold:
+                state['open_until'] = time.monotonic() + self.cooldown_seconds
+                state['probing'] = False
+                self.logger.warning(
+                    f"主机连续失败{state['failures']}次，熔断{self.cooldown_seconds:.0f}秒: {host}"
+                )
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """
+    计算带抖动的指数退避时间：取指数上限的一半再加上随机的另一半
+
+    Args:
+        attempt: 已失败的次数（从0开始）
+        base: 基础等待时间（秒）
+        cap: 最长等待时间（秒）
+    """
+    delay = min(cap, base * (2 ** attempt))
+    return delay / 2 + random.uniform(0, delay / 2)
@@ -0,0 +1,84 @@
+"""
+自适应并发控制模块
+按AIMD（加性增、乘性减）调整同时进行的模型请求数
+"""
+
+import logging
+import threading
+import time
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    自适应并发限制器
+
+    延迟正常的成功请求使并发上限缓慢增加（每完成约一轮并发数的请求加1），
+    遇到429/5xx时上限减半。同一轮中多个请求同时失败只减半一次：
+    只有在上次减半之后才发出的请求失败时才会再次减半。
+    """
+
+    def __init__(self, initial: int, min_limit: int = 1, max_limit: int = 8, latency_target: float = 30.0):
+        """
+        Args:
+            initial: 初始并发数
+            min_limit: 最小并发数
+            max_limit: 最大并发数
+            latency_target: 单次请求耗时不超过该值（秒）时才增加并发
+        """
+        self.logger = logging.getLogger(__name__)
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.latency_target = latency_target
+        self._limit = float(min(self.max_limit, max(self.min_limit, initial)))
+        self._in_flight = 0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def acquire(self) -> None:
+        """
+        等待直到正在进行的请求数低于当前上限
+        """
+        with self._condition:
+            while self._in_flight >= int(self._limit):
+                self._condition.wait()
+            self._in_flight += 1
+
+    def release(self) -> None:
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    def on_success(self, latency: float) -> None:
+        """
+        记录一次成功请求及其耗时
+        """
+        if latency > self.latency_target:
+            return
+        with self._condition:
+            if self._limit >= self.max_limit:
+                return
+            previous = int(self._limit)
+            self._limit = min(self.max_limit, self._limit + 1.0 / self._limit)
+            if int(self._limit) > previous:
+                self.logger.info(f"模型请求延迟正常，并发数增加到 {int(self._limit)}")
+                self._condition.notify_all()
+
+    def on_overload(self, sent_at: float) -> None:
+        """
+        记录一次过载响应（429/5xx）
+
+        Args:
+            sent_at: 该请求发出时的time.monotonic()
+        """
+        with self._condition:
+            if sent_at < self._last_decrease:
+                return
+            self._last_decrease = time.monotonic()
+            previous = int(self._limit)
+            self._limit = max(float(self.min_limit), self._limit / 2)
+            if int(self._limit) < previous:
+                self.logger.warning(f"模型接口过载，并发数降低到 {int(self._limit)}")
@@ -21,6 +21,25 @@ LLM_API_KEY = "YOUR_API_KEY_HERE"
 # 示例：gpt-4, gpt-3.5-turbo, moonshot-v1-8k, deepseek-chat
 LLM_MODEL_NAME = "YOUR_MODEL_NAME_HERE"
 
+# 多个模型接口（可选）：配置后忽略上面的单个接口设置，请求按各接口的延迟和错误率分配，
+# 某个接口出错时自动切换到其他接口重试。每个接口可单独设置最大并发数和权重（权重越大分到的请求越多）；
+# 未设置max_concurrency时，同步处理按AI_MAX_CONCURRENCY、异步处理按AI_ASYNC_CONCURRENCY限制；
+# 模型的上下文窗口较小时可设置context_budget（默认为LLM_CONTEXT_BUDGET），正文按所有接口中最小的预算截断
+LLM_ENDPOINTS = []
+# LLM_ENDPOINTS = [
+#     {"name": "deepseek", "base_url": "https://api.deepseek.com/v1", "api_key": "sk-...",
+#      "model": "deepseek-chat", "max_concurrency": 8, "weight": 1.0},
+#     {"name": "moonshot", "base_url": "https://api.moonshot.cn/v1", "api_key": "sk-...",
+#      "model": "moonshot-v1-8k", "max_concurrency": 4, "weight": 0.5, "context_budget": 6000},
+# ]
+
+# 接口延迟的EWMA平滑系数（0~1，越大越偏重最近的请求）
+LLM_ROUTER_EWMA_ALPHA = 0.3
+
+# 接口连续失败多少次后暂停使用，以及暂停的秒数（只有一个接口时不会暂停）
+LLM_ENDPOINT_FAILURE_THRESHOLD = 3
+LLM_ENDPOINT_COOLDOWN = 60
+
 # ======================================================
 # BBC新闻源配置
 # ======================================================
@@ -59,6 +78,35 @@ RSS_FEEDS = [
 # 每个RSS源抓取条数（当RSS_FEEDS未指定max_items时使用）
 RSS_PER_FEED = 5
 
+# 是否记录RSS源健康度（耗时、产出、失败次数），并据此排序抓取、跳过长期失效的源
+# 查看报告：python main.py --health-report
+ENABLE_SOURCE_HEALTH = True
+
+# RSS源健康度记录文件
+SOURCE_HEALTH_FILE = "./cache/source_health.json"
+
+# RSS源连续失败多少次后视为失效（失效期间跳过抓取）
+SOURCE_DEAD_AFTER_FAILURES = 5
+
+# 失效的RSS源每隔多少小时重新尝试一次
+SOURCE_DEAD_RETRY_HOURS = 24
+
+# 并发抓取RSS源的工作线程数（设为1即串行抓取），同一主机仍受PER_HOST_CONCURRENCY限制
+RSS_FETCH_WORKERS = 8
+
+# ======================================================
+# 去重配置
+# ======================================================
+
+# 是否检测正文近似重复的新闻（SimHash聚类，每组只翻译一篇，其余标注为"也见于"）
+ENABLE_NEAR_DUP_DETECTION = True
+
+# 判定为近似重复的最大SimHash汉明距离（64位指纹）
+NEAR_DUP_MAX_DISTANCE = 6
+
+# 参与近似重复检测的最少词数（过短的正文不参与，避免误判）
+NEAR_DUP_MIN_TOKENS = 30
+
 # ======================================================
 # 输出配置
 # ======================================================
@@ -90,9 +138,61 @@ REQUEST_TIMEOUT = 30
 # 重试次数
 MAX_RETRIES = 3
 
-# 请求间隔（秒，防止被封IP）
+# 按内容类型的响应体大小上限（字节），超出时中止下载且不重试
+MAX_RESPONSE_BYTES = {
+    "xml": 10 * 1024 * 1024,     # RSS/Atom订阅源
+    "html": 5 * 1024 * 1024,     # 网页
+    "default": 5 * 1024 * 1024,  # 其他类型
+}
+
+# 单次下载的最长时间（秒）
+MAX_DOWNLOAD_SECONDS = 60
+
+# 重试等待的最长时间（秒，重试间隔按REQUEST_DELAY指数增长并带随机抖动）
+RETRY_BACKOFF_MAX = 30
+
+# 同一主机连续失败多少次后熔断（熔断期间该主机的请求直接失败）
+CIRCUIT_BREAKER_THRESHOLD = 5
+
+# 熔断冷却时间（秒）
+CIRCUIT_BREAKER_COOLDOWN = 300
+
+# 请求间隔（秒，防止被封IP；也是重试退避的基础时间）
 REQUEST_DELAY = 1
 
+# 每个主机每秒最多请求数（令牌桶限速，不同主机互不影响；默认为1/REQUEST_DELAY）
+HOST_RATE_LIMIT = 1.0
+
+# 每个主机允许的突发请求数
+HOST_RATE_BURST = 2
+
+# 是否遵循robots.txt中的Crawl-delay（会进一步降低该主机的请求速率）
+RESPECT_ROBOTS_CRAWL_DELAY = True
+
+# 并发抓取正文的工作线程数
+ARTICLE_FETCH_WORKERS = 4
+
+# 同一主机同时进行的最大请求数
+PER_HOST_CONCURRENCY = 2
+
+# 是否启用HTTP条件请求缓存（ETag/Last-Modified，页面未修改时复用上次解析结果）
+ENABLE_HTTP_CACHE = True
+
+# HTTP条件请求缓存目录
+HTTP_CACHE_DIR = "./cache/http"
+
+# 是否启用正文缓存（已提取过的文章在有效期内不再重复下载和解析）
+ENABLE_ARTICLE_CACHE = True
+
+# 正文缓存数据库文件
+ARTICLE_CACHE_DB = "./cache/articles.db"
+
+# 正文缓存有效期（小时）
+ARTICLE_CACHE_TTL_HOURS = 72
+
+# 正文缓存最多保留条数（超出时淘汰最久未访问的文章）
+ARTICLE_CACHE_MAX_ENTRIES = 5000
+
 # ======================================================
 # AI处理配置
 # ======================================================
@@ -115,6 +215,73 @@ TRANSLATION_PROMPT = """请对以下英文新闻标题和正文进行翻译和
 
 请开始翻译和总结："""
 
+# 单次请求的上下文预算（输入+输出的token数）：正文按预算截断，超出部分丢弃
+# 输出包含正文的完整译文，正文越长输出也越长，因此保留的正文约为预算的一半
+LLM_CONTEXT_BUDGET = 6000
+
+# 输出token数（max_tokens）的上下限：实际值按正文译文长度和SUMMARY_MAX_WORDS估算
+# 正文的译文放不进上限时，正文会被进一步截断
+AI_MIN_OUTPUT_TOKENS = 512
+AI_MAX_OUTPUT_TOKENS = 4000
+
+# 是否使用流式输出（stream: true）：逐段接收响应并记录首token耗时
+LLM_STREAM = False
+
+# 流式输出的字符上限：超过后立即断开，避免模型输出失控时继续计费（<=0表示不限制）
+LLM_STREAM_MAX_CHARS = 8000
+
+# 同时进行的模型请求数：从初始值开始，延迟正常时逐步增加，遇到429/5xx时减半
+AI_INITIAL_CONCURRENCY = 2
+AI_MIN_CONCURRENCY = 1
+AI_MAX_CONCURRENCY = 8
+
+# 单次模型请求耗时不超过该值（秒）时才增加并发
+AI_LATENCY_TARGET = 30
+
+# 是否把连续的短新闻（如只有标题和简介的RSS条目）合并为一次请求
+AI_PACK_SHORT_ITEMS = True
+
+# 正文不超过该字符数的新闻视为短新闻
+AI_PACK_SHORT_CHARS = 800
+
+# 每次合并请求最多包含的新闻条数和输入token预算
+AI_PACK_MAX_ITEMS = 8
+AI_PACK_TOKEN_BUDGET = 2000
+
+# 合并请求的最大输出token数：每条短新闻的输出与单独请求时相同（按TRANSLATION_PROMPT和SUMMARY_MAX_WORDS），
+# 预计输出超过该值时不再往同一组里加新闻
+AI_PACK_MAX_OUTPUT_TOKENS = 4000
+
+# 异步接口（aprocess_batch，需安装httpx）同时进行的模型请求数
+AI_ASYNC_CONCURRENCY = 64
+
+# 是否缓存模型响应（模型、prompt和参数都相同时直接复用，重跑当天任务不再重复计费）
+ENABLE_LLM_CACHE = True
+
+# 模型响应缓存数据库文件
+LLM_CACHE_DB = "./cache/llm_responses.db"
+
+# 模型响应缓存有效期（小时）
+LLM_CACHE_TTL_HOURS = 168
+
+# 模型响应缓存总大小上限（MB，超出时淘汰最久未使用的响应）
+LLM_CACHE_MAX_MB = 200
+
+# 抓取与AI处理之间的队列长度（AI处理跟不上时抓取会暂停，控制内存占用）
+PIPELINE_QUEUE_SIZE = 10
+
+# 是否记录运行检查点（中断后可用 python main.py --resume 续跑）
+ENABLE_CHECKPOINTS = True
+
+# 检查点目录（每天一个 run_{date}.jsonl 文件）
+CHECKPOINT_DIR = "./output/checkpoints"
+
+# 每写入多少条检查点记录执行一次fsync
+CHECKPOINT_FSYNC_EVERY = 10
+
+# 分片抓取结果目录（python main.py --shard 0/4 写入，--merge 合并；--shards 4 在本机启动4个进程）
+SHARD_DIR = "./output/shards"
+
 # ======================================================
 # 日志配置
 # ======================================================
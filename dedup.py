@@ -0,0 +1,329 @@
+"""
+新闻去重模块
+在AI处理前合并来自不同类别页面和RSS源的重复新闻，避免重复调用模型
+"""
+
+import hashlib
+import itertools
+import logging
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+import config
+from url_utils import canonicalize_url
+
+SIMHASH_BITS = 64
+
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+# 位切片计数的通道宽度，以及字节到通道展开值的查找表
+_LANE_BITS = 32
+_SPREAD_TABLE = [
+    sum(1 << (bit * _LANE_BITS) for bit in range(8) if byte >> bit & 1)
+    for byte in range(256)
+]
+
+
+def _feature_hash(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def compute_simhash(text: str, min_tokens: int = 0) -> Optional[int]:
+    """
+    计算文本的64位SimHash指纹（特征为相邻三个词组成的片段）
+
+    Args:
+        text: 文本内容
+        min_tokens: 最少词数，不足时返回None（过短文本容易误判）
+
+    Returns:
+        指纹整数，文本过短时返回None
+    """
+    tokens = _WORD_RE.findall(text.lower()) if text else []
+    if len(tokens) < max(min_tokens, 1):
+        return None
+
+    if len(tokens) >= 3:
+        shingles = (' '.join(tokens[i:i + 3]) for i in range(len(tokens) - 2))
+    else:
+        shingles = iter(tokens)
+
+    # 位切片累加：每个哈希位展开到独立的32位计数通道，一次大整数加法同时累加64位
+    accumulator = 0
+    total = 0
+    for shingle, count in Counter(shingles).items():
+        value = _feature_hash(shingle)
+        spread = 0
+        for byte_index in range(8):
+            spread |= _SPREAD_TABLE[value >> (byte_index * 8) & 0xFF] << (byte_index * 8 * _LANE_BITS)
+        accumulator += spread * count
+        total += count
+
+    fingerprint = 0
+    lane_mask = (1 << _LANE_BITS) - 1
+    for bit in range(SIMHASH_BITS):
+        # 该位为1的权重超过一半时指纹该位取1
+        if (accumulator >> (bit * _LANE_BITS) & lane_mask) * 2 > total:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+class SimHashIndex:
+    """
+    SimHash近邻索引（Manku等人的多表置换方案）
+
+    将64位指纹切分为b段（b > max_distance）：汉明距离不超过max_distance的两个指纹
+    至少有b - max_distance段完全相同（抽屉原理），因此对每种b - max_distance段的组合
+    各建一张表，以这些段的位作为键分桶，查找时只比较同桶内的候选。
+
+    每次查找的开销约为 表数 × PROBE_COST + 表数 × 条目数 / 2^键位数（查表加比较候选）。条目增多到
+    多切分一段的开销更低时重建索引：键的位数随条目数增长，每次查找的比较次数不超过下一种
+    切分方式的表数，与条目数无关，整体为近线性复杂度。
+    """
+
+    # 查一张表的开销相当于比较几个候选（实测约为2）
+    PROBE_COST = 2
+
+    # 表的数量上限（max_distance较大时段数增长受此限制）
+    MAX_TABLES = 512
+
+    def __init__(self, max_distance: int):
+        self.max_distance = max_distance
+        # 累计比较过的候选数，用于评估索引效果
+        self.comparisons = 0
+        self._entries: List[Tuple[int, object]] = []
+        self._build(max_distance + 1)
+
+    def _layout(self, block_count: int) -> Tuple[List[int], int]:
+        """
+        切分为block_count段时各表的键掩码，以及最短的键位数
+        """
+        bounds = [block * SIMHASH_BITS // block_count for block in range(block_count + 1)]
+        block_masks = [((1 << (end - start)) - 1) << start for start, end in zip(bounds, bounds[1:])]
+        masks = [sum(combo) for combo in itertools.combinations(block_masks, block_count - self.max_distance)]
+        return masks, min(bin(mask).count('1') for mask in masks)
+
+    def _build(self, block_count: int) -> None:
+        """
+        按block_count段重建各表，并计算改为多切分一段的条目数
+        """
+        masks, key_bits = self._layout(block_count)
+        self._block_count = block_count
+        self._tables: List[Tuple[int, Dict[int, List]]] = [(mask, {}) for mask in masks]
+        for fingerprint, value in self._entries:
+            self._insert(fingerprint, value)
+
+        # 两种切分方式每次查找的开销相等时的条目数：表数 × (PROBE_COST + 条目数 / 2^键位数)
+        self._capacity = float('inf')
+        next_count = block_count + 1
+        if next_count <= SIMHASH_BITS and math.comb(next_count, self.max_distance) <= self.MAX_TABLES:
+            tables, next_tables = len(masks), math.comb(next_count, self.max_distance)
+            next_key_bits = self._layout(next_count)[1]
+            slope = tables / (1 << key_bits) - next_tables / (1 << next_key_bits)
+            if slope > 0:
+                self._capacity = self.PROBE_COST * (next_tables - tables) / slope
+
+    def _insert(self, fingerprint: int, value) -> None:
+        entry = (fingerprint, value)
+        for mask, buckets in self._tables:
+            bucket = buckets.get(fingerprint & mask)
+            if bucket is None:
+                buckets[fingerprint & mask] = [entry]
+            else:
+                bucket.append(entry)
+
+    def find(self, fingerprint: int):
+        """
+        查找与指纹距离不超过max_distance的已有条目，未找到返回None
+        """
+        for mask, buckets in self._tables:
+            candidates = buckets.get(fingerprint & mask)
+            if candidates:
+                self.comparisons += len(candidates)
+                for candidate_fp, value in candidates:
+                    if bin(candidate_fp ^ fingerprint).count('1') <= self.max_distance:
+                        return value
+        return None
+
+    def add(self, fingerprint: int, value) -> None:
+        self._entries.append((fingerprint, value))
+        if len(self._entries) > self._capacity:
+            # 条目增多后多切分一段更快：重建时包含新条目
+            self._build(self._block_count + 1)
+        else:
+            self._insert(fingerprint, value)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class NewsDeduplicator:
+    """
+    新闻去重器
+
+    1. 按规范化URL合并重复新闻，保留所有来源类别
+    2. 按正文SimHash聚类近似重复的新闻（如多家媒体转载的通讯社稿件），
+       每个聚类只保留一个代表条目，其余来源记录在also_reported_by中
+    """
+
+    # 合并时可能修改的条目字段
+    MERGED_FIELDS = ('category', 'categories', 'content', 'summary', 'also_reported_by')
+
+    def __init__(self, defer_merges: bool = False):
+        """
+        Args:
+            defer_merges: 为True时不修改已加入的条目（条目可能正在其他线程中处理），
+                之后合并进来的类别、正文和来源记录在旁路表中，由apply_merges()写回
+        """
+        self.logger = logging.getLogger(__name__)
+        self.defer_merges = defer_merges
+        self._by_url: Dict[str, Dict] = {}
+        # 近似重复条目的URL -> 代表条目also_reported_by中对应的来源记录
+        self._near_dup_by_url: Dict[str, Dict] = {}
+        # 推迟合并时：id(条目) -> (条目, 合并后的字段)
+        self._deferred: Dict[int, Tuple[Dict, Dict]] = {}
+        self.duplicate_count = 0
+        self.near_duplicate_count = 0
+
+        self._simhash_index = None
+        if getattr(config, "ENABLE_NEAR_DUP_DETECTION", True):
+            self._simhash_index = SimHashIndex(getattr(config, "NEAR_DUP_MAX_DISTANCE", 6))
+        self._min_tokens = getattr(config, "NEAR_DUP_MIN_TOKENS", 30)
+
+    def add(self, item: Dict) -> bool:
+        """
+        加入一条新闻
+
+        URL重复的新闻合并到首次出现的条目上（追加类别，保留更长的正文和摘要）；
+        正文近似重复的新闻挂到聚类代表条目的also_reported_by中，之后与它URL
+        重复的新闻只并入该来源记录，不修改代表条目。
+
+        Returns:
+            True表示是新条目，False表示已合并到已有条目
+        """
+        key = canonicalize_url(item.get('url', ''))
+        category = item.get('category', '')
+
+        existing = self._by_url.get(key) if key else None
+        if existing is not None:
+            self._merge(self._merge_target(existing), item)
+            self.duplicate_count += 1
+            self.logger.debug(f"合并重复新闻: [{category}] {item.get('title', '')}")
+            return False
+
+        source = self._near_dup_by_url.get(key) if key else None
+        if source is not None:
+            self._merge_source(source, item)
+            self.duplicate_count += 1
+            self.logger.debug(f"合并重复的近似重复新闻: [{category}] {item.get('title', '')}")
+            return False
+
+        fingerprint = None
+        if self._simhash_index is not None:
+            fingerprint = compute_simhash(item.get('content', ''), self._min_tokens)
+            representative = self._simhash_index.find(fingerprint) if fingerprint is not None else None
+            if representative is not None:
+                source = self._attach_near_duplicate(self._merge_target(representative), item)
+                if key:
+                    self._near_dup_by_url[key] = source
+                return False
+
+        if not item.get('categories'):
+            item['categories'] = [category] if category else []
+        item.setdefault('also_reported_by', [])
+        if key:
+            self._by_url[key] = item
+        if fingerprint is not None:
+            self._simhash_index.add(fingerprint, item)
+        return True
+
+    def _merge_target(self, item: Dict) -> Dict:
+        """
+        返回合并时要修改的字典：推迟合并时为该条目在旁路表中的记录，否则为条目本身
+        """
+        if not self.defer_merges:
+            return item
+        entry = self._deferred.get(id(item))
+        if entry is None:
+            record = {field: item[field] for field in self.MERGED_FIELDS if field in item}
+            record['categories'] = list(item['categories'])
+            record['also_reported_by'] = list(item['also_reported_by'])
+            entry = self._deferred[id(item)] = (item, record)
+        return entry[1]
+
+    def apply_merges(self) -> int:
+        """
+        把推迟的合并写回条目（在条目不再被其他线程使用后调用）
+
+        Returns:
+            更新的条目数
+        """
+        for item, record in self._deferred.values():
+            item.update(record)
+        count = len(self._deferred)
+        self._deferred.clear()
+        return count
+
+    def _attach_near_duplicate(self, representative: Dict, item: Dict) -> Dict:
+        """
+        将近似重复条目作为"也见于"来源挂到代表条目上
+
+        Returns:
+            新增的来源记录
+        """
+        source = {
+            'title': item.get('title', ''),
+            'url': item.get('url', ''),
+            'category': item.get('category', ''),
+        }
+        representative['also_reported_by'].append(source)
+        self.near_duplicate_count += 1
+        self.logger.debug(
+            f"近似重复新闻: [{item.get('category', '')}] {item.get('title', '')} "
+            f"-> {representative.get('title', '')}"
+        )
+        return source
+
+    @staticmethod
+    def _merge_source(source: Dict, duplicate: Dict) -> None:
+        """
+        将URL重复的近似重复条目并入已有的来源记录（只追加类别）
+        """
+        category = duplicate.get('category', '')
+        categories = source['category'].split(' / ') if source.get('category') else []
+        if category and category not in categories:
+            source['category'] = ' / '.join(categories + [category])
+
+    def _merge(self, target: Dict, duplicate: Dict) -> None:
+        """
+        将重复条目的信息合并到目标条目
+        """
+        category = duplicate.get('category', '')
+        if category and category not in target['categories']:
+            target['categories'].append(category)
+            target['category'] = ' / '.join(target['categories'])
+
+        for field in ('content', 'summary'):
+            if len(duplicate.get(field) or '') > len(target.get(field) or ''):
+                target[field] = duplicate[field]
+
+
+def deduplicate_news(news_items: List[Dict]) -> List[Dict]:
+    """
+    合并新闻列表中的重复条目，保持首次出现的顺序
+
+    Args:
+        news_items: 抓取到的新闻列表
+
+    Returns:
+        去重后的新闻列表
+    """
+    deduplicator = NewsDeduplicator()
+    unique_items = [item for item in news_items if deduplicator.add(item)]
+    deduplicator.logger.info(
+        f"去重完成: {len(news_items)} 条 -> {len(unique_items)} 条"
+        f"（合并 {deduplicator.duplicate_count} 条重复，{deduplicator.near_duplicate_count} 条近似重复）"
+    )
+    return unique_items
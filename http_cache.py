@@ -0,0 +1,88 @@
+"""
+HTTP条件请求缓存模块
+按URL保存ETag/Last-Modified校验值及上次解析结果，配合304响应复用
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+
+class HttpValidatorCache:
+    """基于文件的HTTP校验值缓存，每个URL一个JSON文件"""
+
+    def __init__(self, cache_dir: str):
+        self.logger = logging.getLogger(__name__)
+        self.cache_dir = cache_dir
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path_for(self, url: str) -> str:
+        digest = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.json")
+
+    def get(self, url: str) -> Optional[Dict]:
+        """
+        读取URL对应的缓存记录
+
+        Returns:
+            包含etag、last_modified、items的字典，不存在或损坏时返回None
+        """
+        path = self._path_for(url)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"读取HTTP缓存失败: {url} - {e}")
+            return None
+
+        if entry.get('url') != url or not isinstance(entry.get('items'), list):
+            return None
+        return entry
+
+    def conditional_headers(self, entry: Optional[Dict]) -> Dict[str, str]:
+        """
+        根据缓存记录生成条件请求头
+        """
+        headers = {}
+        if not entry:
+            return headers
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, url: str, response_headers, items: List[Dict]) -> None:
+        """
+        保存响应的校验值和解析结果（响应不带校验值时不缓存）
+        """
+        etag = response_headers.get('ETag')
+        last_modified = response_headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+
+        entry = {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'stored_at': time.time(),
+            'items': items,
+        }
+
+        path = self._path_for(url)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            self.logger.warning(f"写入HTTP缓存失败: {url} - {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
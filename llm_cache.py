@@ -0,0 +1,146 @@
+"""
+模型响应缓存模块
+使用SQLite持久化模型的响应，按（模型、prompt、temperature、max_tokens）的哈希索引，支持TTL过期和按总大小的LRU淘汰
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import List, Optional
+
+
+def make_cache_key(model: str, prompt: str, temperature: float, max_tokens: int) -> str:
+    """
+    生成缓存键：请求参数相同时模型的输出视为可复用
+    """
+    raw = json.dumps([model, prompt, temperature, max_tokens], ensure_ascii=False)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class LLMResponseCache:
+    """模型响应缓存（SQLite）"""
+
+    def __init__(self, db_path: str, ttl_seconds: float, max_bytes: int):
+        """
+        Args:
+            db_path: SQLite数据库文件路径
+            ttl_seconds: 缓存有效期（秒）
+            max_bytes: 响应文本的总大小上限，超出时按最近访问时间淘汰
+        """
+        self.logger = logging.getLogger(__name__)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access)"
+            )
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        读取缓存的响应
+
+        Returns:
+            未过期的响应文本，未命中返回None
+        """
+        return self.get_first([key])
+
+    def get_first(self, keys: List[str]) -> Optional[str]:
+        """
+        按顺序查找多个键（如同一请求在不同模型下的键），返回第一个未过期的响应，只计一次命中或未命中
+        """
+        now = time.time()
+        with self._lock:
+            for key in keys:
+                row = self._conn.execute(
+                    "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    continue
+                if now - row[1] > self.ttl_seconds:
+                    with self._conn:
+                        self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    continue
+
+                self.hits += 1
+                with self._conn:
+                    self._conn.execute(
+                        "UPDATE responses SET last_access = ? WHERE key = ?", (now, key)
+                    )
+                return row[0]
+
+            self.misses += 1
+        return None
+
+    def put(self, key: str, model: str, response: str) -> None:
+        """
+        写入响应并在超出总大小时淘汰最久未访问的条目
+        """
+        if not response:
+            return
+
+        now = time.time()
+        size = len(response.encode('utf-8'))
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO responses (key, model, response, size, created_at, last_access)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (key, model, response, size, now, now)
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        """
+        删除过期条目，并按LRU淘汰超出总大小的条目（需在持有锁时调用）
+        """
+        self._conn.execute(
+            "DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+        )
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        overflow = total - self.max_bytes
+        if overflow <= 0:
+            return
+
+        evicted = []
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY last_access ASC"):
+            evicted.append((key,))
+            overflow -= size
+            if overflow <= 0:
+                break
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", evicted)
+        self.logger.debug(f"模型响应缓存淘汰 {len(evicted)} 条")
+
+    def summary(self) -> str:
+        total = self.hits + self.misses
+        rate = self.hits / total * 100 if total else 0.0
+        return f"模型响应缓存: 命中 {self.hits}，未命中 {self.misses}（命中率 {rate:.0f}%）"
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,249 @@
+"""
+模型接口路由模块
+在多个OpenAI格式的接口之间分配请求：按EWMA延迟、错误率、当前负载和权重选择接口，接口持续失败时自动切换
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Iterable, List, Optional, Tuple
+
+import config
+
+# 未配置时的占位值（与config.example.py一致）
+_PLACEHOLDERS = {"YOUR_API_BASE_URL_HERE", "YOUR_API_KEY_HERE", "YOUR_MODEL_NAME_HERE"}
+
+
+class LLMEndpoint:
+    """单个模型接口及其运行统计"""
+
+    def __init__(self, name: str, base_url: str, api_key: str, model: str,
+                 max_concurrency: int = 8, weight: float = 1.0, async_max_concurrency: Optional[int] = None,
+                 context_budget: int = 6000):
+        """
+        Args:
+            max_concurrency: 同步处理（线程池）时该接口同时进行的请求数上限
+            weight: 权重，越大分到的请求越多
+            async_max_concurrency: 异步处理时的请求数上限，默认与max_concurrency相同
+            context_budget: 单次请求的上下文预算（输入+输出的token数）
+        """
+        self.name = name
+        self.base_url = base_url.rstrip('/')
+        self.api_key = api_key
+        self.model = model
+        self.max_concurrency = max(1, max_concurrency)
+        self.async_max_concurrency = max(1, async_max_concurrency or max_concurrency)
+        self.weight = weight if weight > 0 else 1.0
+        self.context_budget = context_budget
+        self.headers = {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+        }
+
+        self.in_flight = 0
+        self.ewma_latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+        self.requests = 0
+        self.failures = 0
+
+    @property
+    def chat_url(self) -> str:
+        return f"{self.base_url}/chat/completions"
+
+
+def load_endpoints() -> List[LLMEndpoint]:
+    """
+    读取config.LLM_ENDPOINTS；未配置时使用LLM_API_BASE_URL/LLM_API_KEY/LLM_MODEL_NAME作为唯一接口
+
+    接口未设置max_concurrency时，同步处理的上限为AI_MAX_CONCURRENCY，异步处理的上限为AI_ASYNC_CONCURRENCY；
+    未设置context_budget时使用LLM_CONTEXT_BUDGET。
+
+    Raises:
+        ValueError: 接口缺少地址、密钥或模型名称时抛出
+    """
+    default_concurrency = getattr(config, "AI_MAX_CONCURRENCY", 8)
+    default_async_concurrency = getattr(config, "AI_ASYNC_CONCURRENCY", 64)
+    default_context_budget = getattr(config, "LLM_CONTEXT_BUDGET", 6000)
+    entries = getattr(config, "LLM_ENDPOINTS", None) or [{
+        "name": "default",
+        "base_url": config.LLM_API_BASE_URL,
+        "api_key": config.LLM_API_KEY,
+        "model": config.LLM_MODEL_NAME,
+    }]
+
+    endpoints = []
+    for index, entry in enumerate(entries):
+        name = entry.get("name") or f"endpoint-{index + 1}"
+        base_url = entry.get("base_url", "")
+        api_key = entry.get("api_key", "")
+        model = entry.get("model", "")
+        if not api_key or api_key in _PLACEHOLDERS:
+            raise ValueError(f"请先在config.py中配置LLM_API_KEY（接口 {name}）")
+        if not model or model in _PLACEHOLDERS:
+            raise ValueError(f"请先在config.py中配置LLM_MODEL_NAME（接口 {name}）")
+        if not base_url or base_url in _PLACEHOLDERS:
+            raise ValueError(f"请先在config.py中配置LLM_API_BASE_URL（接口 {name}）")
+        max_concurrency = entry.get("max_concurrency")
+        endpoints.append(LLMEndpoint(
+            name, base_url, api_key, model,
+            max_concurrency=max_concurrency or default_concurrency,
+            weight=entry.get("weight", 1.0),
+            async_max_concurrency=max_concurrency or default_async_concurrency,
+            context_budget=entry.get("context_budget") or default_context_budget
+        ))
+    return endpoints
+
+
+def _wake(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class LLMRouter:
+    """
+    模型接口路由器
+
+    每次请求选择得分最低的接口：EWMA延迟 × (1 + 当前负载占比) × (1 + 错误率惩罚) ÷ 权重。
+    还没有延迟数据的接口优先尝试；连续失败达到阈值的接口冷却一段时间，
+    所有接口都在冷却时仍会选出一个作为探测。
+    """
+
+    def __init__(self, endpoints: List[LLMEndpoint], ewma_alpha: float = 0.3,
+                 failure_threshold: int = 3, cooldown_seconds: float = 60):
+        """
+        Args:
+            endpoints: 接口列表
+            ewma_alpha: EWMA平滑系数（越大越偏重最近的请求）
+            failure_threshold: 连续失败多少次后进入冷却
+            cooldown_seconds: 冷却时间（秒）
+        """
+        if not endpoints:
+            raise ValueError("至少需要配置一个模型接口")
+        self.logger = logging.getLogger(__name__)
+        self.endpoints = endpoints
+        self.ewma_alpha = ewma_alpha
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown_seconds = cooldown_seconds
+        self._condition = threading.Condition()
+        # 等待空闲名额的异步请求：(事件循环, Future)，release()时全部唤醒
+        self._async_waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+    @property
+    def models(self) -> List[str]:
+        return list(dict.fromkeys(endpoint.model for endpoint in self.endpoints))
+
+    @staticmethod
+    def _limit(endpoint: LLMEndpoint, asynchronous: bool) -> int:
+        return endpoint.async_max_concurrency if asynchronous else endpoint.max_concurrency
+
+    def _score(self, endpoint: LLMEndpoint, limit: int) -> float:
+        latency = endpoint.ewma_latency if endpoint.ewma_latency is not None else 0.0
+        load = 1 + endpoint.in_flight / limit
+        return (latency + 0.1) * load * (1 + 10 * endpoint.error_rate) / endpoint.weight
+
+    def _select(self, exclude: Iterable[str], asynchronous: bool = False) -> Optional[LLMEndpoint]:
+        """
+        选出有空闲名额的最佳接口并占用一个名额，没有可用接口时返回None（需在持有锁时调用）
+        """
+        now = time.monotonic()
+        excluded = set(exclude)
+        candidates = [e for e in self.endpoints if e.name not in excluded] or self.endpoints
+        available = [e for e in candidates if e.in_flight < self._limit(e, asynchronous)]
+        if not available:
+            return None
+        healthy = [e for e in available if e.cooldown_until <= now] or available
+        endpoint = min(healthy, key=lambda e: self._score(e, self._limit(e, asynchronous)))
+        endpoint.in_flight += 1
+        return endpoint
+
+    def acquire(self, exclude: Iterable[str] = ()) -> LLMEndpoint:
+        """
+        选择接口并占用一个并发名额，所有接口都满载时等待
+
+        Args:
+            exclude: 本次请求已经失败过的接口名称（全部失败过时忽略）
+        """
+        exclude = tuple(exclude)
+        with self._condition:
+            while True:
+                endpoint = self._select(exclude)
+                if endpoint:
+                    return endpoint
+                self._condition.wait()
+
+    async def aacquire(self, exclude: Iterable[str] = ()) -> LLMEndpoint:
+        """
+        acquire的异步版本：使用异步并发上限，满载时挂起等待release()唤醒
+        """
+        exclude = tuple(exclude)
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._condition:
+                endpoint = self._select(exclude, asynchronous=True)
+                if endpoint:
+                    return endpoint
+                waiter = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+            await waiter
+
+    def release(self, endpoint: LLMEndpoint) -> None:
+        with self._condition:
+            endpoint.in_flight -= 1
+            self._condition.notify_all()
+            waiters, self._async_waiters = self._async_waiters, []
+        for loop, waiter in waiters:
+            try:
+                loop.call_soon_threadsafe(_wake, waiter)
+            except RuntimeError:
+                # 事件循环已关闭
+                pass
+
+    def has_alternative(self, exclude: Iterable[str]) -> bool:
+        """
+        是否还有未失败过、且不在冷却中的接口可以切换
+        """
+        excluded = set(exclude)
+        now = time.monotonic()
+        with self._condition:
+            return any(e.name not in excluded and e.cooldown_until <= now for e in self.endpoints)
+
+    def record_success(self, endpoint: LLMEndpoint, latency: float) -> None:
+        with self._condition:
+            alpha = self.ewma_alpha
+            endpoint.requests += 1
+            endpoint.ewma_latency = latency if endpoint.ewma_latency is None else \
+                alpha * latency + (1 - alpha) * endpoint.ewma_latency
+            endpoint.error_rate = (1 - alpha) * endpoint.error_rate
+            if endpoint.cooldown_until:
+                self.logger.info(f"模型接口恢复正常: {endpoint.name}")
+            endpoint.consecutive_failures = 0
+            endpoint.cooldown_until = 0.0
+
+    def record_failure(self, endpoint: LLMEndpoint) -> None:
+        with self._condition:
+            alpha = self.ewma_alpha
+            endpoint.requests += 1
+            endpoint.failures += 1
+            endpoint.error_rate = alpha + (1 - alpha) * endpoint.error_rate
+            endpoint.consecutive_failures += 1
+            now = time.monotonic()
+            if endpoint.consecutive_failures >= self.failure_threshold and len(self.endpoints) > 1 \
+                    and endpoint.cooldown_until <= now:
+                endpoint.cooldown_until = now + self.cooldown_seconds
+                self.logger.warning(
+                    f"模型接口连续失败{endpoint.consecutive_failures}次，暂停使用{self.cooldown_seconds:.0f}秒: {endpoint.name}"
+                )
+
+    def summary(self) -> str:
+        lines = []
+        with self._condition:
+            for endpoint in self.endpoints:
+                latency = f"{endpoint.ewma_latency:.2f}s" if endpoint.ewma_latency is not None else "-"
+                lines.append(
+                    f"模型接口 {endpoint.name}（{endpoint.model}）: 请求 {endpoint.requests}，"
+                    f"失败 {endpoint.failures}，EWMA延迟 {latency}，错误率 {endpoint.error_rate:.0%}"
+                )
+        return '\n'.join(lines)
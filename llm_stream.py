@@ -0,0 +1,73 @@
+"""
+流式响应模块
+逐行解析OpenAI格式的SSE流式响应，记录首token耗时，输出超过字符上限时提前停止
+"""
+
+import json
+import logging
+import time
+from typing import List, Optional
+
+
+class StreamCollector:
+    """
+    SSE流式响应收集器
+
+    每收到一行调用一次feed()，返回False时应停止读取并关闭连接。
+    推理模型的reasoning_content也计入字符上限（同样按输出计费），但不计入最终内容。
+    """
+
+    def __init__(self, max_chars: int, started_at: float):
+        """
+        Args:
+            max_chars: 输出字符上限，<=0表示不限制
+            started_at: 请求发出时的time.monotonic()，用于计算首token耗时
+        """
+        self.logger = logging.getLogger(__name__)
+        self.max_chars = max_chars
+        self.started_at = started_at
+        self.ttft: Optional[float] = None
+        self.output_chars = 0
+        self.truncated = False
+        self.finish_reason: Optional[str] = None
+        self._parts: List[str] = []
+
+    @property
+    def content(self) -> str:
+        return ''.join(self._parts)
+
+    def feed(self, line: str) -> bool:
+        """
+        处理一行SSE数据
+
+        Returns:
+            是否继续读取
+        """
+        if not line or not line.startswith('data:'):
+            return True
+        data = line[5:].strip()
+        if data == '[DONE]':
+            return False
+
+        try:
+            chunk = json.loads(data)
+            choice = chunk['choices'][0]
+        except (ValueError, KeyError, IndexError, TypeError):
+            self.logger.debug(f"忽略无法解析的流式数据: {data[:100]}")
+            return True
+
+        delta = choice.get('delta') or {}
+        text = delta.get('content') or ''
+        reasoning = delta.get('reasoning_content') or ''
+        if (text or reasoning) and self.ttft is None:
+            self.ttft = time.monotonic() - self.started_at
+        if text:
+            self._parts.append(text)
+        self.output_chars += len(text) + len(reasoning)
+        if choice.get('finish_reason'):
+            self.finish_reason = choice['finish_reason']
+
+        if 0 < self.max_chars < self.output_chars:
+            self.truncated = True
+            return False
+        return True
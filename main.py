@@ -6,14 +6,20 @@
 import os
 import sys
 import time
+import argparse
 import logging
+import subprocess
 from datetime import datetime
-from typing import List
+from typing import List, Optional, Tuple
 
 import config
 from news_scraper import NewsScraper
 from ai_processor import AIProcessor
 from output_formatter import OutputFormatter
+from pipeline import NewsPipeline
+from checkpoint import RunJournal
+from source_health import SourceHealthRegistry
+from sharding import ShardReader, parse_shard, write_shard
 
 
 def setup_logging():
@@ -34,9 +40,82 @@ def setup_logging():
     )
 
 
-def main():
+def open_journal(date_str: str, resume: bool):
+    """
+    打开当天的运行检查点日志，未启用检查点时返回None
+    """
+    if not getattr(config, "ENABLE_CHECKPOINTS", True):
+        return None
+
+    checkpoint_dir = getattr(config, "CHECKPOINT_DIR", os.path.join(config.OUTPUT_DIR, "checkpoints"))
+    path = os.path.join(checkpoint_dir, f"run_{date_str}.jsonl")
+    return RunJournal(
+        path,
+        resume=resume,
+        fsync_every=getattr(config, "CHECKPOINT_FSYNC_EVERY", 10)
+    )
+
+
+def shard_output_path(date_str: str, shard: Tuple[int, int]) -> str:
+    """
+    分片结果的默认文件路径
+    """
+    shard_dir = getattr(config, "SHARD_DIR", os.path.join(config.OUTPUT_DIR, "shards"))
+    return os.path.join(shard_dir, f"shard_{date_str}_{shard[0]}of{shard[1]}.jsonl")
+
+
+def scrape_shard(shard: Tuple[int, int], output_path: str) -> bool:
+    """
+    只抓取本分片负责的类别和RSS源，结果写入JSONL文件（去重和AI处理在合并时进行）
+    """
+    logger = logging.getLogger(__name__)
+    logger.info(f"分片 {shard[0]}/{shard[1]} 开始抓取")
+    try:
+        count = write_shard(output_path, NewsScraper(shard=shard).iter_all())
+    except KeyboardInterrupt:
+        logger.warning("程序被用户中断")
+        return False
+    except Exception as e:
+        logger.exception(f"分片抓取出错: {e}")
+        return False
+
+    logger.info(f"分片 {shard[0]}/{shard[1]} 抓取完成: {count} 条 -> {output_path}")
+    return True
+
+
+def run_local_shards(shard_count: int, date_str: str) -> List[str]:
+    """
+    在本机启动shard_count个子进程分别抓取各分片，等待全部结束
+
+    Returns:
+        抓取成功的分片文件路径
+    """
+    logger = logging.getLogger(__name__)
+    workers = []
+    for index in range(shard_count):
+        path = shard_output_path(date_str, (index, shard_count))
+        command = [sys.executable, os.path.abspath(__file__),
+                   "--shard", f"{index}/{shard_count}", "--shard-output", path]
+        workers.append((index, path, subprocess.Popen(command)))
+    logger.info(f"已启动 {shard_count} 个分片抓取进程")
+
+    paths = []
+    for index, path, process in workers:
+        if process.wait() == 0:
+            paths.append(path)
+        else:
+            logger.error(f"分片 {index}/{shard_count} 抓取失败（退出码 {process.returncode}），合并时跳过")
+    return paths
+
+
+def main(resume: bool = False, shard_paths: Optional[List[str]] = None, shard_count: int = 0):
     """
     主函数：执行完整的新闻抓取和AI处理流程
+
+    Args:
+        resume: 是否从当天的检查点续跑（跳过已处理成功的新闻）
+        shard_paths: 分片结果文件；指定时不再抓取，合并这些分片后去重并进行AI处理
+        shard_count: 大于0时先在本机启动对应数量的分片抓取进程，再合并处理
     """
     start_time = time.time()
     logger = logging.getLogger(__name__)
@@ -46,19 +125,8 @@ def main():
     logger.info("=" * 60)
 
     try:
-        # 步骤1：抓取新闻
-        logger.info("\n[步骤 1/3] 开始抓取BBC新闻...")
-        scraper = NewsScraper()
-        raw_news = scraper.scrape_all()
-
-        if not raw_news:
-            logger.error("未抓取到任何新闻，程序退出")
-            return False
-
-        logger.info(f"成功抓取 {len(raw_news)} 条新闻")
-
-        # 步骤2：AI翻译和总结
-        logger.info("\n[步骤 2/3] 开始AI翻译和总结...")
+        # 步骤1：初始化AI处理器（先验证配置，避免抓取完才发现API不可用）
+        logger.info("\n[步骤 1/3] 初始化AI处理器...")
         try:
             processor = AIProcessor()
         except ValueError as e:
@@ -70,7 +138,29 @@ def main():
         if not processor.validate_config():
             return False
 
-        processed_news = processor.process_batch(raw_news)
+        # 步骤2：边抓取边进行AI翻译和总结
+        date_str = datetime.now().strftime("%Y-%m-%d")
+        if shard_count:
+            shard_paths = run_local_shards(shard_count, date_str)
+        if shard_paths is not None:
+            logger.info(f"\n[步骤 2/3] 合并 {len(shard_paths)} 个分片并进行AI翻译和总结...")
+            scraper = ShardReader(shard_paths)
+        else:
+            logger.info("\n[步骤 2/3] 开始抓取新闻并进行AI翻译和总结...")
+            scraper = NewsScraper()
+        journal = open_journal(date_str, resume)
+        try:
+            pipeline = NewsPipeline(scraper, processor, journal=journal, resume=resume)
+            raw_news, processed_news = pipeline.run()
+        finally:
+            if journal:
+                journal.close()
+
+        if not raw_news:
+            logger.error("未抓取到任何新闻，程序退出")
+            return False
+
+        logger.info(f"成功抓取 {pipeline.scraped_count} 条新闻，去重后 {len(raw_news)} 条")
 
         if not processed_news:
             logger.error("AI处理失败，没有成功处理任何新闻")
@@ -83,7 +173,6 @@ def main():
         # 步骤3：生成输出
         logger.info("\n[步骤 3/3] 生成输出文件...")
         formatter = OutputFormatter()
-        date_str = datetime.now().strftime("%Y-%m-%d")
 
         # 生成Markdown
         markdown_content = formatter.generate_markdown(processed_news, date_str)
@@ -112,7 +201,7 @@ def main():
         logger.info("执行完成！")
         logger.info("=" * 60)
         logger.info(f"总执行时间: {execution_time:.2f} 秒")
-        logger.info(f"抓取新闻: {len(raw_news)} 条")
+        logger.info(f"抓取新闻: {pipeline.scraped_count} 条（去重后 {len(raw_news)} 条）")
         logger.info(f"AI处理成功: {success_count} 条")
         logger.info(f"AI处理失败: {len(processed_news) - success_count} 条")
 
@@ -142,20 +231,25 @@ def display_config_status():
     logger.info("-" * 40)
 
     # 检查API配置
-    if config.LLM_API_KEY == "YOUR_API_KEY_HERE":
-        logger.warning("⚠  LLM_API_KEY 未配置")
+    endpoints = getattr(config, "LLM_ENDPOINTS", None)
+    if endpoints:
+        names = ', '.join(entry.get("name") or f"endpoint-{index + 1}" for index, entry in enumerate(endpoints))
+        logger.info(f"✓  LLM_ENDPOINTS 已配置 {len(endpoints)} 个接口: {names}")
     else:
-        logger.info("✓  LLM_API_KEY 已配置")
+        if config.LLM_API_KEY == "YOUR_API_KEY_HERE":
+            logger.warning("⚠  LLM_API_KEY 未配置")
+        else:
+            logger.info("✓  LLM_API_KEY 已配置")
 
-    if config.LLM_API_BASE_URL == "YOUR_API_BASE_URL_HERE":
-        logger.warning("⚠  LLM_API_BASE_URL 未配置")
-    else:
-        logger.info("✓  LLM_API_BASE_URL 已配置")
+        if config.LLM_API_BASE_URL == "YOUR_API_BASE_URL_HERE":
+            logger.warning("⚠  LLM_API_BASE_URL 未配置")
+        else:
+            logger.info("✓  LLM_API_BASE_URL 已配置")
 
-    if config.LLM_MODEL_NAME == "YOUR_MODEL_NAME_HERE":
-        logger.warning("⚠  LLM_MODEL_NAME 未配置")
-    else:
-        logger.info("✓  LLM_MODEL_NAME 已配置")
+        if config.LLM_MODEL_NAME == "YOUR_MODEL_NAME_HERE":
+            logger.warning("⚠  LLM_MODEL_NAME 未配置")
+        else:
+            logger.info("✓  LLM_MODEL_NAME 已配置")
 
     # 检查邮件配置
     if config.SMTP_USERNAME == "your_email@gmail.com":
@@ -175,11 +269,79 @@ def display_config_status():
     logger.info(f"  预计总数: {len(config.BBC_CATEGORIES) * config.NEWS_PER_CATEGORY}条")
 
 
+def parse_args():
+    """
+    解析命令行参数
+    """
+    parser = argparse.ArgumentParser(description="每日新闻抓取与AI翻译总结系统")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="从当天的检查点续跑，跳过已处理成功的新闻"
+    )
+    parser.add_argument(
+        "--health-report",
+        action="store_true",
+        help="输出RSS源健康度报告后退出"
+    )
+    shard_group = parser.add_mutually_exclusive_group()
+    shard_group.add_argument(
+        "--shard",
+        metavar="I/N",
+        help="只抓取第I个分片（共N个，I从0开始），结果写入JSONL文件，不进行AI处理"
+    )
+    shard_group.add_argument(
+        "--merge",
+        nargs="+",
+        metavar="FILE",
+        help="合并分片结果文件，去重后进行AI处理和输出"
+    )
+    shard_group.add_argument(
+        "--shards",
+        type=int,
+        metavar="N",
+        help="在本机启动N个进程分片抓取，完成后合并处理"
+    )
+    parser.add_argument(
+        "--shard-output",
+        metavar="FILE",
+        help="--shard 模式的输出文件（默认写入SHARD_DIR）"
+    )
+    args = parser.parse_args()
+    if args.shard:
+        try:
+            args.shard = parse_shard(args.shard)
+        except ValueError as e:
+            parser.error(str(e))
+    if args.shards is not None and args.shards < 1:
+        parser.error("--shards 必须大于0")
+    return args
+
+
+def print_health_report():
+    """
+    输出RSS源健康度报告
+    """
+    registry = SourceHealthRegistry(getattr(config, "SOURCE_HEALTH_FILE", "./cache/source_health.json"),
+                                    dead_after_failures=getattr(config, "SOURCE_DEAD_AFTER_FAILURES", 5))
+    print(registry.report())
+
+
 if __name__ == "__main__":
+    args = parse_args()
+
+    if args.health_report:
+        print_health_report()
+        sys.exit(0)
+
     # 设置日志
     setup_logging()
     logger = logging.getLogger(__name__)
 
+    if args.shard:
+        output_path = args.shard_output or shard_output_path(datetime.now().strftime("%Y-%m-%d"), args.shard)
+        sys.exit(0 if scrape_shard(args.shard, output_path) else 1)
+
     # 显示欢迎信息
     logger.info("=" * 60)
     logger.info("每日新闻抓取与AI翻译总结系统")
@@ -189,7 +351,7 @@ if __name__ == "__main__":
     display_config_status()
 
     # 执行主程序
-    success = main()
+    success = main(resume=args.resume, shard_paths=args.merge, shard_count=args.shards or 0)
 
     if success:
         logger.info("\n🎉 程序执行成功！")
@@ -3,98 +3,591 @@ BBC新闻爬虫模块
 负责从BBC网站抓取新闻内容
 """
 
+import codecs
+import html
+import html.entities
 import time
 import logging
-from typing import List, Dict
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from urllib.parse import urlparse
 import os
 import xml.etree.ElementTree as ET
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 import re
 
 import config
+from article_cache import ArticleCache
+from circuit_breaker import HostCircuitBreaker, backoff_delay
+from http_cache import HttpValidatorCache
+from rate_limiter import HostRateLimiter
+from source_health import SourceHealthRegistry
+from sharding import in_shard
+
+# 结构简单的HTML标签（标签名被捕获；属性中不含尖括号，引号必须成对）
+_SIMPLE_TAG_RE = re.compile(r'</?([a-zA-Z][a-zA-Z0-9:-]*)(?:\s(?:[^<>"\']|"[^<>"]*"|\'[^<>\']*\')*)?/?>')
+
+# 内容不按普通文本处理的标签，出现时交给BeautifulSoup
+_RAW_TEXT_TAGS = {'script', 'style', 'template', 'textarea', 'title', 'xmp', 'iframe', 'noembed', 'noframes', 'noscript', 'plaintext'}
+
+# 文档末尾未结束的实体引用（如"&amp"）
+_TRAILING_ENTITY_RE = re.compile(r'&[^\s;<>]*\Z')
+
+# 文本中的实体引用：完整的命名/数字引用，或&后紧跟名称字符但不构成完整引用的情况
+_ENTITY_REF_RE = re.compile(
+    r'&(?:([a-zA-Z][a-zA-Z0-9]*);|#([0-9]{1,7});|#[xX]([0-9a-fA-F]{1,6});|(?=[a-zA-Z0-9#]))'
+)
+
+# html.unescape替换为空、而html.parser原样保留的数字引用码点
+_DROPPED_CODEPOINTS = frozenset(
+    [*range(0x1, 0x9), 0xb, *range(0xe, 0x20), 0x7f, *range(0xfdd0, 0xfdf0)]
+    + [plane + offset for plane in range(0, 0x110000, 0x10000) for offset in (0xfffe, 0xffff)]
+)
+
+# Content-Type中的charset参数
+_CHARSET_RE = re.compile(r'charset\s*=\s*([^\s;]+)', re.I)
+
+# 带encoding属性的XML声明（允许前置BOM和空白）
+_XML_ENCODING_DECL_RE = re.compile(rb'^(?:\xef\xbb\xbf)?\s*<\?xml[^>]*\bencoding\s*=', re.I)
+
+# 下载响应体时每次读取的字节数
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# 未配置MAX_RESPONSE_BYTES时的响应体大小上限
+DEFAULT_MAX_RESPONSE_BYTES = 5 * 1024 * 1024
+
+# robots.txt的大小和下载时间上限，超出时按没有robots规则处理；
+# 下载时间在每块读完后检查，小块读取使缓慢写出的服务器也能及时中止
+ROBOTS_TXT_MAX_BYTES = 512 * 1024
+ROBOTS_TXT_MAX_SECONDS = 10
+ROBOTS_TXT_CHUNK_SIZE = 1024
+
+# 流式解析RSS时每次送入解析器的字节数
+RSS_PARSE_CHUNK_SIZE = 64 * 1024
+
+# 判断订阅源是否带XML编码声明时至少读取的字节数
+XML_DECL_PEEK_BYTES = 1024
+
+
+# RSS/Atom条目字段对应的标签后缀（按去掉命名空间后的标签名匹配）
+_ENTRY_FIELD_SUFFIXES = (
+    ('title', ('title',)),
+    ('link', ('link',)),
+    ('summary', ('summary', 'description', 'content', 'encoded')),
+)
+
+# 标签到字段类型的缓存，避免对每个元素重复做命名空间拆分和后缀匹配
+_TAG_FIELD_CACHE: Dict[str, Optional[str]] = {}
+
+
+def _has_ambiguous_entity(text: str) -> bool:
+    """
+    文本中是否有html.unescape与BeautifulSoup(html.parser)处理结果不同的实体引用
+
+    只有以分号结束的已知命名引用和有效码点的数字引用两者一致；缺少分号的引用
+    （如"&copy2023"、"&ampx"）、未知名称（如"&notit;"）和控制字符码点都不一致。
+    """
+    if '&' not in text:
+        return False
+    for match in _ENTITY_REF_RE.finditer(text):
+        name, decimal, hexadecimal = match.groups()
+        if name is not None:
+            if name + ';' not in html.entities.html5:
+                return True
+        elif decimal is not None or hexadecimal is not None:
+            codepoint = int(decimal, 10) if decimal is not None else int(hexadecimal, 16)
+            if codepoint in _DROPPED_CODEPOINTS:
+                return True
+        else:
+            return True
+    return False
+
+
+def _local_name(tag: str) -> str:
+    """
+    去掉XML标签的命名空间前缀
+    """
+    return tag.rsplit('}', 1)[-1]
+
+
+def _classify_tag(tag) -> Optional[str]:
+    """
+    返回标签对应的条目字段（title/link/summary），无关标签返回None
+    """
+    try:
+        return _TAG_FIELD_CACHE[tag]
+    except KeyError:
+        pass
+    except TypeError:
+        return None
+
+    field = None
+    if isinstance(tag, str):
+        local = _local_name(tag)
+        for name, suffixes in _ENTRY_FIELD_SUFFIXES:
+            if local.endswith(suffixes):
+                field = name
+                break
+    _TAG_FIELD_CACHE[tag] = field
+    return field
+
+
+class ResponseTooLargeError(requests.RequestException):
+    """响应体超出配置的大小上限"""
 
 
 class NewsScraper:
     """BBC新闻爬虫类"""
 
-    def __init__(self):
+    def __init__(self, shard: Optional[Tuple[int, int]] = None):
+        """
+        Args:
+            shard: (分片序号, 分片总数)，只抓取按稳定哈希分到该分片的类别和RSS源；None表示全部抓取
+        """
+        self.shard = shard
         self.session = requests.Session()
         self.session.headers.update({
             "User-Agent": config.USER_AGENT
         })
         self.logger = logging.getLogger(__name__)
 
-    def fetch_page(self, url: str) -> str:
+        # 并发抓取配置：工作线程共享同一个Session连接池，并按主机限制并发数
+        self.article_workers = max(1, int(getattr(config, "ARTICLE_FETCH_WORKERS", 4)))
+        self.rss_workers = max(1, int(getattr(config, "RSS_FETCH_WORKERS", 8)))
+        self.per_host_concurrency = max(1, int(getattr(config, "PER_HOST_CONCURRENCY", 2)))
+        adapter = HTTPAdapter(
+            pool_connections=max(16, self.rss_workers),
+            pool_maxsize=max(self.article_workers, self.per_host_concurrency)
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._host_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._host_lock = threading.Lock()
+
+        self.circuit_breaker = HostCircuitBreaker(
+            failure_threshold=getattr(config, "CIRCUIT_BREAKER_THRESHOLD", 5),
+            cooldown_seconds=getattr(config, "CIRCUIT_BREAKER_COOLDOWN", 300)
+        )
+        self.retry_backoff_max = getattr(config, "RETRY_BACKOFF_MAX", 30)
+
+        # 响应体大小和下载时间上限，防止异常源占用大量内存和时间
+        self.max_response_bytes = getattr(config, "MAX_RESPONSE_BYTES", {"default": DEFAULT_MAX_RESPONSE_BYTES})
+        self.max_download_seconds = getattr(config, "MAX_DOWNLOAD_SECONDS", 60)
+
+        # 按主机令牌桶限速，取代请求之间固定的time.sleep
+        default_rate = 1.0 / config.REQUEST_DELAY if config.REQUEST_DELAY > 0 else 0
+        self.rate_limiter = HostRateLimiter(
+            rate=getattr(config, "HOST_RATE_LIMIT", default_rate),
+            burst=getattr(config, "HOST_RATE_BURST", 2),
+            user_agent=config.USER_AGENT,
+            robots_fetcher=self._fetch_robots_txt if getattr(config, "RESPECT_ROBOTS_CRAWL_DELAY", True) else None
+        )
+
+        self.http_cache = None
+        if getattr(config, "ENABLE_HTTP_CACHE", True):
+            self.http_cache = HttpValidatorCache(getattr(config, "HTTP_CACHE_DIR", "./cache/http"))
+
+        self.source_health = None
+        if getattr(config, "ENABLE_SOURCE_HEALTH", True):
+            self.source_health = SourceHealthRegistry(
+                getattr(config, "SOURCE_HEALTH_FILE", "./cache/source_health.json"),
+                dead_after_failures=getattr(config, "SOURCE_DEAD_AFTER_FAILURES", 5),
+                dead_retry_hours=getattr(config, "SOURCE_DEAD_RETRY_HOURS", 24)
+            )
+
+        self.article_cache = None
+        if getattr(config, "ENABLE_ARTICLE_CACHE", True):
+            self.article_cache = ArticleCache(
+                getattr(config, "ARTICLE_CACHE_DB", "./cache/articles.db"),
+                ttl_seconds=getattr(config, "ARTICLE_CACHE_TTL_HOURS", 72) * 3600,
+                max_entries=getattr(config, "ARTICLE_CACHE_MAX_ENTRIES", 5000)
+            )
+
+    def _request(self, url: str, headers: Optional[Dict[str, str]] = None,
+                 stream_body: bool = False) -> requests.Response:
         """
-        获取网页内容
+        发送GET请求（带重试），返回响应对象
 
         Args:
             url: 要访问的URL
-
-        Returns:
-            网页HTML内容
+            headers: 额外的请求头
+            stream_body: 为True时不预先读取响应体：返回未关闭的响应，响应体通过response.body_chunks
+                （受同样的大小和时间限制）分块读取，调用方负责关闭响应；只有连接和响应头阶段会重试
 
         Raises:
             requests.RequestException: 请求失败时抛出异常
         """
         for attempt in range(config.MAX_RETRIES):
+            # 主机已熔断时直接失败，不再重试
+            self.circuit_breaker.before_request(url)
             try:
+                self.rate_limiter.acquire(url)
+                started = time.monotonic()
                 response = self.session.get(
                     url,
+                    headers=headers,
                     timeout=config.REQUEST_TIMEOUT,
-                    allow_redirects=True
+                    allow_redirects=True,
+                    stream=True
                 )
-                response.raise_for_status()
-                self.logger.info(f"成功获取页面: {url}")
-                return response.text
+                keep_open = False
+                try:
+                    response.raise_for_status()
+                    if stream_body:
+                        response.body_chunks = self._iter_body(response, url) if response.status_code != 304 else iter(())
+                        keep_open = True
+                    elif response.status_code != 304:
+                        self._read_body(response, url)
+                finally:
+                    if not keep_open:
+                        response.close()
+                # 本次请求的实际耗时（不含限速排队和重试等待）
+                response.download_seconds = time.monotonic() - started
+                self.circuit_breaker.record_success(url)
+                if response.status_code == 304:
+                    self.logger.info(f"页面未修改: {url}")
+                else:
+                    self.logger.info(f"成功获取页面: {url}")
+                return response
+
+            except ResponseTooLargeError as e:
+                # 内容超限不是临时故障，不重试
+                self.circuit_breaker.record_success(url)
+                self.logger.error(f"响应内容超出限制，放弃请求: {url} - {e}")
+                raise
 
             except requests.RequestException as e:
+                if self._is_host_failure(e):
+                    self.circuit_breaker.record_failure(url)
+                else:
+                    # 主机能正常响应（如404），不计入主机故障
+                    self.circuit_breaker.record_success(url)
+
                 self.logger.warning(f"第 {attempt + 1}/{config.MAX_RETRIES} 次请求失败: {url} - {e}")
                 if attempt < config.MAX_RETRIES - 1:
-                    time.sleep(config.REQUEST_DELAY * (attempt + 1))
+                    time.sleep(backoff_delay(attempt, config.REQUEST_DELAY, self.retry_backoff_max))
                 else:
                     self.logger.error(f"请求失败（已重试{config.MAX_RETRIES}次）: {url}")
                     raise
 
+            except Exception:
+                # 其他异常（如URL无法解析）也计为失败：熔断恢复的探测请求必须有结果，否则主机一直处于探测中
+                self.circuit_breaker.record_failure(url)
+                raise
+
+    def _max_bytes_for(self, response: requests.Response) -> int:
+        """
+        根据Content-Type确定响应体大小上限
+        """
+        content_type = response.headers.get('Content-Type', '').lower()
+        if 'xml' in content_type or 'rss' in content_type or 'atom' in content_type:
+            kind = 'xml'
+        elif 'html' in content_type:
+            kind = 'html'
+        else:
+            kind = 'default'
+        return self.max_response_bytes.get(kind, self.max_response_bytes.get('default', DEFAULT_MAX_RESPONSE_BYTES))
+
+    def _iter_body(self, response: requests.Response, url: str, limit: Optional[int] = None,
+                   max_seconds: Optional[float] = None, chunk_size: int = DOWNLOAD_CHUNK_SIZE) -> Iterator[bytes]:
+        """
+        返回分块读取响应体的迭代器，超出大小或时间限制时中止下载
+
+        Args:
+            response: 以stream=True发出的请求的响应
+            url: 请求的URL（用于错误信息）
+            limit: 响应体字节数上限，为None时按Content-Type取MAX_RESPONSE_BYTES中的上限
+            max_seconds: 下载总耗时上限，为None时使用MAX_DOWNLOAD_SECONDS（每读完一块检查一次）
+            chunk_size: 每次读取的字节数
+
+        Raises:
+            ResponseTooLargeError: Content-Length超出上限时立即抛出；已读取的字节数超出上限时在迭代中抛出
+            requests.Timeout: 下载总耗时超出MAX_DOWNLOAD_SECONDS时在迭代中抛出
+        """
+        if limit is None:
+            limit = self._max_bytes_for(response)
+        content_length = response.headers.get('Content-Length', '')
+        if content_length.isdigit() and int(content_length) > limit:
+            raise ResponseTooLargeError(f"Content-Length {content_length} 超过上限 {limit} 字节")
+        return self._iter_chunks(response, url, limit,
+                                 self.max_download_seconds if max_seconds is None else max_seconds, chunk_size)
+
+    def _iter_chunks(self, response: requests.Response, url: str, limit: int,
+                     max_seconds: float, chunk_size: int) -> Iterator[bytes]:
+        deadline = time.monotonic() + max_seconds
+        size = 0
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            size += len(chunk)
+            if size > limit:
+                raise ResponseTooLargeError(f"已读取 {size} 字节，超过上限 {limit} 字节")
+            if time.monotonic() > deadline:
+                raise requests.Timeout(f"下载超过 {max_seconds} 秒: {url}")
+            yield chunk
+
+    def _read_body(self, response: requests.Response, url: str, limit: Optional[int] = None,
+                   max_seconds: Optional[float] = None, chunk_size: int = DOWNLOAD_CHUNK_SIZE) -> None:
+        """
+        读取完整的响应体（受大小和时间限制，见_iter_body）
+
+        读取完成后内容写回response，后续可照常使用response.content/response.text。
+        """
+        response._content = b''.join(self._iter_body(response, url, limit, max_seconds, chunk_size))
+        response._content_consumed = True
+
+    def _fetch_robots_txt(self, robots_url: str) -> Optional[str]:
+        """
+        获取robots.txt文本（不重试，失败、超出大小或时间上限时返回None）
+
+        由限速器在持有该主机的锁时调用，因此不经过_request（其中的限速等待会再次请求同一把锁），
+        只复用_read_body的大小和时间限制。
+        """
+        try:
+            response = self.session.get(robots_url, timeout=config.REQUEST_TIMEOUT, stream=True)
+            try:
+                if response.status_code != 200:
+                    return None
+                self._read_body(response, robots_url, limit=ROBOTS_TXT_MAX_BYTES,
+                                max_seconds=ROBOTS_TXT_MAX_SECONDS, chunk_size=ROBOTS_TXT_CHUNK_SIZE)
+            finally:
+                response.close()
+            return response.text
+        except requests.RequestException as e:
+            self.logger.debug(f"获取robots.txt失败，按没有robots规则处理: {robots_url} - {e}")
+        return None
+
+    @staticmethod
+    def _is_host_failure(error: requests.RequestException) -> bool:
+        """
+        判断请求错误是否说明主机不可用（连接失败、超时或5xx）
+        """
+        if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+            return True
+        response = getattr(error, 'response', None)
+        return response is not None and response.status_code >= 500
+
+    def fetch_page(self, url: str, as_bytes: bool = False) -> Union[str, bytes]:
+        """
+        获取网页内容
+
+        Args:
+            url: 要访问的URL
+            as_bytes: 为True时返回原始字节，由解析器按声明的编码自行解码，
+                避免响应头缺少charset时对整个响应体做编码探测
+
+        Returns:
+            网页HTML内容
+
+        Raises:
+            requests.RequestException: 请求失败时抛出异常
+        """
+        response = self._request(url)
+        if as_bytes:
+            return response.content
+        return response.text
+
+    @staticmethod
+    def _declared_charset(response: requests.Response) -> Optional[str]:
+        """
+        返回响应头Content-Type中明确声明的charset，未声明时返回None
+        （不使用requests对text/*默认的ISO-8859-1）
+        """
+        match = _CHARSET_RE.search(response.headers.get('Content-Type', ''))
+        return match.group(1).strip('"\'') if match else None
+
+    def _fetch_parsed(self, url: str, parse: Callable[[Union[bytes, Iterator[bytes]], Optional[str]], List[Dict]],
+                      stats: Optional[Dict] = None, stream: bool = False) -> List[Dict]:
+        """
+        获取页面并解析为条目列表，支持条件请求缓存
+
+        页面带有ETag/Last-Modified且解析出至少一个条目时缓存解析结果；再次请求时发送
+        If-None-Match/If-Modified-Since，收到304则直接复用上次的解析结果。
+
+        Args:
+            url: 要访问的URL
+            parse: 将页面内容解析为条目列表的函数，参数为响应字节（stream为True时是字节块的迭代器）
+                和响应头声明的charset
+            stats: 传入字典时写入请求耗时（seconds）、是否为304（not_modified），
+                以及实际下载了响应体时的字节数（bytes）
+            stream: 为True时边下载边解析，parse停止读取后立即关闭连接，不再下载剩余内容
+
+        Returns:
+            条目列表
+        """
+        cached = self.http_cache.get(url) if self.http_cache else None
+        headers = self.http_cache.conditional_headers(cached) if self.http_cache else None
+        response = self._request(url, headers=headers, stream_body=stream)
+        try:
+            not_modified = response.status_code == 304 and cached is not None
+            if not_modified:
+                if stats is not None:
+                    stats['seconds'] = response.download_seconds
+                    stats['not_modified'] = True
+                self.logger.info(f"使用缓存的解析结果（{len(cached['items'])}条）: {url}")
+                return cached['items']
+
+            charset = self._declared_charset(response)
+            if stream:
+                downloaded = 0
+                started = time.monotonic()
+
+                def counted_chunks() -> Iterator[bytes]:
+                    nonlocal downloaded
+                    for chunk in response.body_chunks:
+                        downloaded += len(chunk)
+                        yield chunk
+
+                items = parse(counted_chunks(), charset)
+                seconds = response.download_seconds + time.monotonic() - started
+            else:
+                items = parse(response.content, charset)
+                downloaded = len(response.content or b'')
+                seconds = response.download_seconds
+        finally:
+            response.close()
+
+        if stats is not None:
+            stats['seconds'] = seconds
+            stats['not_modified'] = False
+            stats['bytes'] = downloaded
+        # 解析失败或没有得到条目时不保存校验值，否则之后的304会一直复用空结果
+        if self.http_cache and items:
+            self.http_cache.store(url, response.headers, items)
+        return items
+
+    def _get_host_semaphore(self, url: str) -> threading.BoundedSemaphore:
+        """
+        获取URL所属主机的并发信号量（同一主机同时最多PER_HOST_CONCURRENCY个请求）
+        """
+        host = urlparse(url).netloc.lower()
+        with self._host_lock:
+            semaphore = self._host_semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.per_host_concurrency)
+                self._host_semaphores[host] = semaphore
+            return semaphore
+
+    def _iter_concurrently(self, func: Callable, items: List, max_workers: int,
+                           submit_order: Optional[List[int]] = None) -> Iterator:
+        """
+        使用线程池并发执行任务，按输入顺序逐个产出结果（前面的结果就绪即可产出）
+
+        Args:
+            func: 任务函数
+            items: 任务参数列表
+            max_workers: 最大并发数
+            submit_order: 任务的提交顺序（items的下标列表），默认按输入顺序提交
+        """
+        if not items:
+            return
+        if submit_order is None:
+            submit_order = list(range(len(items)))
+
+        if max_workers <= 1 or len(items) == 1:
+            if submit_order == sorted(submit_order):
+                for item in items:
+                    yield func(item)
+                return
+            results = {index: func(items[index]) for index in submit_order}
+            for index in range(len(items)):
+                yield results[index]
+            return
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+            futures = {index: executor.submit(func, items[index]) for index in submit_order}
+            for index in range(len(items)):
+                yield futures[index].result()
+
+    def _run_concurrently(self, func: Callable, items: List, max_workers: int) -> List:
+        """
+        使用线程池并发执行任务，结果按输入顺序返回
+        """
+        return list(self._iter_concurrently(func, items, max_workers))
+
+    def _make_soup(self, html: Union[str, bytes], encoding: Optional[str] = None) -> BeautifulSoup:
+        """
+        构建BeautifulSoup对象：字节内容优先使用响应头声明的编码，
+        其次由BeautifulSoup读取BOM和<meta charset>
+        """
+        if isinstance(html, bytes) and encoding:
+            return BeautifulSoup(html, 'html.parser', from_encoding=encoding)
+        return BeautifulSoup(html, 'html.parser')
+
     def _clean_text(self, text: str) -> str:
         """
         清理HTML文本，提取纯文本内容
+
+        结构简单的文本直接用正则去标签并反转义实体；含注释、脚本、
+        属性中的尖括号等复杂标记，或两种方式解析结果不同的实体引用时
+        回退到BeautifulSoup，结果与get_text(' ', strip=True)一致。
         """
         if not text:
             return ""
-        return BeautifulSoup(text, 'html.parser').get_text(' ', strip=True)
 
-    def _get_xml_text_by_suffix(self, element: ET.Element, suffixes: List[str]) -> str:
-        """
-        根据标签后缀提取XML文本（兼容命名空间）
-        """
-        for child in element.iter():
-            for suffix in suffixes:
-                if child.tag.endswith(suffix):
-                    text = ''.join(child.itertext()).strip()
-                    if text:
-                        return text
-        return ""
+        # html.parser不转换文档末尾未以分号结束的实体，这种情况交给BeautifulSoup
+        if _TRAILING_ENTITY_RE.search(text):
+            return BeautifulSoup(text, 'html.parser').get_text(' ', strip=True)
 
-    def _get_xml_link(self, element: ET.Element) -> str:
+        if '<' not in text:
+            if _has_ambiguous_entity(text):
+                return BeautifulSoup(text, 'html.parser').get_text(' ', strip=True)
+            return html.unescape(text).strip()
+
+        segments = _SIMPLE_TAG_RE.split(text)
+        # split后奇数位置为捕获的标签名
+        tag_names = segments[1::2]
+        texts = segments[0::2]
+        if any(name.lower() in _RAW_TEXT_TAGS for name in tag_names) or \
+                any('<' in part or '>' in part or _has_ambiguous_entity(part) for part in texts):
+            return BeautifulSoup(text, 'html.parser').get_text(' ', strip=True)
+
+        stripped = (html.unescape(part).strip() for part in texts)
+        return ' '.join(part for part in stripped if part)
+
+    def _extract_entry_fields(self, entry: ET.Element) -> Tuple[str, str, str]:
         """
-        提取RSS/Atom条目的链接
+        单次遍历RSS/Atom条目，提取标题、链接和原始摘要
+
+        标题和摘要取文档顺序中第一个有文本的匹配元素；链接优先取
+        rel为alternate（或未指定rel）的href，否则取第一个其他href或链接文本。
+
+        Returns:
+            (标题, 链接, 原始摘要)
         """
+        title = ""
+        summary = ""
+        link = ""
         fallback_link = ""
-        for child in element.iter():
-            if child.tag.endswith('link'):
+
+        for child in entry.iter():
+            field = _classify_tag(child.tag)
+            if field is None:
+                continue
+
+            if field == 'link':
+                if link:
+                    continue
                 href = child.attrib.get('href')
                 if href:
-                    rel = child.attrib.get('rel', 'alternate')
-                    if rel == 'alternate':
-                        return href.strip()
-                    if not fallback_link:
+                    if child.attrib.get('rel', 'alternate') == 'alternate':
+                        link = href.strip()
+                    elif not fallback_link:
                         fallback_link = href.strip()
-                if child.text:
-                    if not fallback_link:
-                        fallback_link = child.text.strip()
-        return fallback_link
+                if child.text and not fallback_link:
+                    fallback_link = child.text.strip()
+            elif field == 'title':
+                if not title:
+                    title = ''.join(child.itertext()).strip()
+            elif not summary:
+                summary = ''.join(child.itertext()).strip()
+
+            if title and summary and link:
+                break
+
+        return title, link or fallback_link, summary
 
     def _parse_rss_sources_file(self, file_path: str) -> List[Dict]:
         """
@@ -174,19 +667,21 @@ class NewsScraper:
 
         return list(unique_sources.values())
 
-    def parse_news_list(self, html: str, category: str, url: str) -> List[Dict]:
+    def parse_news_list(self, html: Union[str, bytes], category: str, url: str,
+                        encoding: Optional[str] = None) -> List[Dict]:
         """
         解析新闻列表页面
 
         Args:
-            html: 页面HTML内容
+            html: 页面HTML内容（str或原始字节）
             category: 新闻类别名称
             url: 页面URL
+            encoding: 响应头声明的编码（仅在html为字节时使用）
 
         Returns:
             新闻条目列表，每个条目包含标题、链接、摘要等
         """
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = self._make_soup(html, encoding)
         news_items = []
 
         try:
@@ -245,96 +740,218 @@ class NewsScraper:
 
         return news_items
 
-    def parse_rss_items(self, xml_content: str, source_name: str, source_url: str, max_items: int) -> List[Dict]:
+    def _build_rss_item(self, entry: ET.Element, source_name: str, source_url: str) -> Optional[Dict]:
         """
-        解析RSS/Atom内容
+        将单个RSS item/Atom entry转换为新闻条目，没有标题和摘要时返回None
         """
-        items = []
-        try:
-            root = ET.fromstring(xml_content)
-        except ET.ParseError as e:
-            self.logger.error(f"解析RSS失败: {source_url} - {e}")
-            return items
+        title, link, summary_raw = self._extract_entry_fields(entry)
+        summary = self._clean_text(summary_raw)
 
-        if root.tag.endswith('feed'):
-            entries = root.findall(".//{*}entry")
-            if not entries:
-                entries = root.findall(".//entry")
-        else:
-            entries = root.findall(".//item")
-            if not entries:
-                entries = root.findall(".//{*}item")
+        if not title and not summary:
+            return None
 
-        for entry in entries:
-            title = self._get_xml_text_by_suffix(entry, ["title"])
-            link = self._get_xml_link(entry)
-            summary_raw = self._get_xml_text_by_suffix(entry, ["summary", "description", "content", "encoded"])
-            summary = self._clean_text(summary_raw)
+        if not link:
+            link = source_url
 
-            if not title and not summary:
-                continue
+        if not title:
+            title = summary[:80] if summary else "未命名"
 
-            if not link:
-                link = source_url
+        return {
+            'title': title,
+            'url': link,
+            'summary': summary,
+            'category': source_name,
+            'content': summary or title
+        }
 
-            if not title:
-                title = summary[:80] if summary else "未命名"
+    def iter_rss_items(self, chunks: Iterable[Union[str, bytes]], source_name: str, source_url: str) -> Iterator[Dict]:
+        """
+        流式解析RSS/Atom内容，每个item/entry闭合后立即产出条目
+
+        已处理的条目会从树中移除并清空，内存占用与已读取的条目数无关；
+        调用方停止迭代后不再读取剩余数据。
 
-            items.append({
-                'title': title,
-                'url': link,
-                'summary': summary,
-                'category': source_name,
-                'content': summary or title
-            })
+        Args:
+            chunks: 订阅源内容的分块（bytes或str）
+            source_name: 订阅源名称
+            source_url: 订阅源URL
 
-            if len(items) >= max_items:
+        Raises:
+            ET.ParseError: XML格式错误时抛出异常
+        """
+        parser = ET.XMLPullParser(events=('start', 'end'))
+        stack: List[ET.Element] = []
+        entry_name = None
+
+        for chunk in chunks:
+            parser.feed(chunk)
+            for event, element in parser.read_events():
+                if event == 'start':
+                    if entry_name is None:
+                        entry_name = 'entry' if _local_name(element.tag) == 'feed' else 'item'
+                    stack.append(element)
+                    continue
+
+                stack.pop()
+                if _local_name(element.tag) != entry_name:
+                    continue
+
+                item = self._build_rss_item(element, source_name, source_url)
+                if stack:
+                    stack[-1].remove(element)
+                element.clear()
+                if item:
+                    yield item
+
+        parser.close()
+
+    def _decode_feed_chunks(self, chunks: Iterator[Union[str, bytes]], encoding: str,
+                            source_url: str) -> Iterator[Union[str, bytes]]:
+        """
+        文档没有XML编码声明时，按响应头声明的编码逐块解码；有声明时原样交给XML解析器
+        """
+        head = b''
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                # 已经是文本，无需解码
+                yield chunk
+                yield from chunks
+                return
+            head += chunk
+            if len(head) >= XML_DECL_PEEK_BYTES:
                 break
 
+        decoder = None
+        if not _XML_ENCODING_DECL_RE.match(head):
+            try:
+                decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+            except LookupError:
+                self.logger.warning(f"未知的编码声明: {encoding} - {source_url}")
+        if decoder is None:
+            yield head
+            yield from chunks
+            return
+
+        yield decoder.decode(head)
+        for chunk in chunks:
+            yield decoder.decode(chunk)
+        yield decoder.decode(b'', final=True)
+
+    def parse_rss_items(self, xml_content: Union[str, bytes, Iterable[bytes]], source_name: str, source_url: str,
+                        max_items: int, encoding: Optional[str] = None) -> List[Dict]:
+        """
+        解析RSS/Atom内容，读满max_items条后立即停止解析（传入字节块的迭代器时也停止读取）
+
+        字节内容直接交给XML解析器，由XML声明决定编码；仅当响应头声明了非UTF-8
+        编码且文档没有XML编码声明时，才按响应头的编码先解码。
+        """
+        if isinstance(xml_content, (str, bytes)):
+            chunks = (
+                xml_content[i:i + RSS_PARSE_CHUNK_SIZE]
+                for i in range(0, len(xml_content), RSS_PARSE_CHUNK_SIZE)
+            )
+        else:
+            chunks = iter(xml_content)
+        if encoding and encoding.lower().replace('_', '-') not in ('utf-8', 'utf8'):
+            chunks = self._decode_feed_chunks(chunks, encoding, source_url)
+
+        items = []
+        try:
+            for item in self.iter_rss_items(chunks, source_name, source_url):
+                items.append(item)
+                if len(items) >= max_items:
+                    break
+        except ET.ParseError as e:
+            self.logger.error(f"解析RSS失败: {source_url} - {e}")
+
         self.logger.info(f"RSS源解析完成: {source_name}（{len(items)}条）")
         return items
 
-    def scrape_rss_sources(self) -> List[Dict]:
+    def _scrape_rss_source(self, source: Dict, per_feed: int) -> List[Dict]:
         """
-        抓取配置的RSS/Atom订阅源
+        抓取并解析单个RSS源（在主机并发限制内执行）
+        """
+        name = source.get("name", "RSS")
+        url = source.get("url")
+        if not url:
+            return []
+
+        max_items = source.get("max_items", per_feed)
+        try:
+            max_items = int(max_items)
+        except (TypeError, ValueError):
+            max_items = per_feed
+        if max_items <= 0:
+            return []
+
+        if self.source_health and self.source_health.is_dead(url):
+            self.logger.info(f"跳过长期失败的RSS源: {name} - {url}")
+            return []
+
+        fetch_stats: Dict = {}
+        start = time.monotonic()
+        try:
+            with self._get_host_semaphore(url):
+                self.logger.info(f"开始抓取RSS: {name}")
+                items = self._fetch_parsed(
+                    url,
+                    lambda chunks, encoding: self.parse_rss_items(chunks, name, url, max_items, encoding),
+                    stats=fetch_stats,
+                    stream=True
+                )
+        except Exception as e:
+            self.logger.error(f"抓取RSS失败: {name} - {url} - {e}")
+            if self.source_health:
+                self.source_health.record_failure(url, name, time.monotonic() - start, str(e))
+            return []
+
+        if self.source_health:
+            self.source_health.record_success(
+                url, name, fetch_stats.get('seconds', time.monotonic() - start), fetch_stats.get('bytes'), len(items),
+                not_modified=fetch_stats.get('not_modified', False)
+            )
+        return items
+
+    def iter_rss_sources(self) -> Iterator[Dict]:
+        """
+        抓取配置的RSS/Atom订阅源，按源顺序逐条产出新闻
         """
         if not getattr(config, "ENABLE_RSS_SOURCES", True):
             self.logger.info("RSS抓取已关闭，跳过RSS源")
-            return []
+            return
 
         sources = self._get_rss_sources()
+        if self.shard:
+            sources = [source for source in sources if in_shard(f"rss:{source['url']}", self.shard)]
         if not sources:
             self.logger.info("未配置RSS源，跳过RSS抓取")
-            return []
+            return
 
         per_feed = getattr(config, "RSS_PER_FEED", config.NEWS_PER_CATEGORY)
-        all_items: List[Dict] = []
+        # 快速、产出多的源先抓取，结果仍按源顺序合并
+        submit_order = self.source_health.order(sources) if self.source_health else None
+        results = self._iter_concurrently(
+            lambda source: self._scrape_rss_source(source, per_feed),
+            sources,
+            self.rss_workers,
+            submit_order=submit_order
+        )
+
+        total = 0
+        for feed_items in results:
+            total += len(feed_items)
+            yield from feed_items
+
+        self.logger.info(f"RSS抓取完成，总共 {total} 条")
+        if self.source_health:
+            self.source_health.save()
+            self.logger.debug(self.source_health.report())
 
-        for source in sources:
-            name = source.get("name", "RSS")
-            url = source.get("url")
-            if not url:
-                continue
-
-            max_items = source.get("max_items", per_feed)
-            try:
-                max_items = int(max_items)
-            except (TypeError, ValueError):
-                max_items = per_feed
-            if max_items <= 0:
-                continue
-            try:
-                self.logger.info(f"开始抓取RSS: {name}")
-                xml_content = self.fetch_page(url)
-                feed_items = self.parse_rss_items(xml_content, name, url, max_items)
-                all_items.extend(feed_items)
-                time.sleep(config.REQUEST_DELAY)
-            except Exception as e:
-                self.logger.error(f"抓取RSS失败: {name} - {url} - {e}")
-                continue
-
-        self.logger.info(f"RSS抓取完成，总共 {len(all_items)} 条")
-        return all_items
+    def scrape_rss_sources(self) -> List[Dict]:
+        """
+        抓取配置的RSS/Atom订阅源
+        """
+        return list(self.iter_rss_sources())
 
     def extract_article_content(self, url: str) -> str:
         """
@@ -347,8 +964,8 @@ class NewsScraper:
             新闻正文文本
         """
         try:
-            html = self.fetch_page(url)
-            soup = BeautifulSoup(html, 'html.parser')
+            response = self._request(url)
+            soup = self._make_soup(response.content, self._declared_charset(response))
 
             # 尝试多种方式提取正文
             content = ""
@@ -389,6 +1006,24 @@ class NewsScraper:
             self.logger.error(f"提取正文失败: {url} - {e}")
             return ""
 
+    def _fetch_article(self, news: Dict) -> str:
+        """
+        在主机并发限制内抓取单篇新闻正文，命中正文缓存时跳过网络请求和解析
+        """
+        url = news['url']
+        if self.article_cache:
+            cached = self.article_cache.get(url)
+            if cached is not None:
+                self.logger.info(f"使用缓存的正文（{len(cached)}字）: {url}")
+                return cached
+
+        with self._get_host_semaphore(url):
+            content = self.extract_article_content(url)
+
+        if self.article_cache and content:
+            self.article_cache.put(url, content)
+        return content
+
     def scrape_category(self, category_name: str, category_path: str) -> List[Dict]:
         """
         抓取指定类别的新闻
@@ -403,42 +1038,57 @@ class NewsScraper:
         self.logger.info(f"开始抓取类别: {category_name}")
 
         url = config.BBC_BASE_URL + category_path
-        html = self.fetch_page(url)
-        news_list = self.parse_news_list(html, category_name, url)
-
-        # 获取每篇新闻的详细内容
-        for news in news_list:
-            content = self.extract_article_content(news['url'])
+        news_list = self._fetch_parsed(
+            url,
+            lambda html, encoding: self.parse_news_list(html, category_name, url, encoding)
+        )
+
+        # 并发获取每篇新闻的详细内容（结果按原顺序写回）
+        contents = self._run_concurrently(self._fetch_article, news_list, self.article_workers)
+        for news, content in zip(news_list, contents):
             news['content'] = content
-            time.sleep(config.REQUEST_DELAY)  # 避免请求过快
 
         self.logger.info(f"类别抓取完成: {category_name}（{len(news_list)}条）")
         return news_list
 
-    def scrape_all(self) -> List[Dict]:
+    def iter_all(self) -> Iterator[Dict]:
         """
-        抓取所有配置类别的新闻
+        抓取所有配置类别和RSS源的新闻，每个类别/订阅源完成后立即产出其新闻
 
-        Returns:
-            所有新闻列表
+        Yields:
+            新闻条目
         """
         self.logger.info("开始抓取所有类别新闻")
-        all_news = []
+        total = 0
+
+        categories = config.BBC_CATEGORIES.items()
+        if self.shard:
+            categories = [(name, path) for name, path in categories if in_shard(f"category:{name}", self.shard)]
+            self.logger.info(f"分片 {self.shard[0]}/{self.shard[1]}：负责 {len(categories)} 个类别")
 
-        for category_name, category_path in config.BBC_CATEGORIES.items():
+        for category_name, category_path in categories:
             try:
                 category_news = self.scrape_category(category_name, category_path)
-                all_news.extend(category_news)
-                time.sleep(config.REQUEST_DELAY * 2)  # 类别间延迟
             except Exception as e:
                 self.logger.error(f"抓取类别失败: {category_name} - {e}")
                 continue
+            total += len(category_news)
+            yield from category_news
 
-        rss_news = self.scrape_rss_sources()
-        all_news.extend(rss_news)
+        for item in self.iter_rss_sources():
+            total += 1
+            yield item
 
-        self.logger.info(f"新闻抓取完成，总共 {len(all_news)} 条")
-        return all_news
+        self.logger.info(f"新闻抓取完成，总共 {total} 条")
+
+    def scrape_all(self) -> List[Dict]:
+        """
+        抓取所有配置类别的新闻
+
+        Returns:
+            所有新闻列表
+        """
+        return list(self.iter_all())
 
 
 # 测试代码
@@ -68,6 +68,7 @@ class OutputFormatter:
 
             md_content += f"## <a name=\"news-{idx}\"></a>{idx}. {original_title}\n\n"
             md_content += f"**类别**: {category} | **原文链接**: [点击访问]({url})\n\n"
+            md_content += self._format_also_reported_markdown(news)
 
             if news.get('processing_status') == 'success':
                 md_content += f"{translated_content}\n\n"
@@ -79,6 +80,35 @@ class OutputFormatter:
         self.logger.info(f"Markdown报告生成完成（{len(processed_news)}条新闻）")
         return md_content
 
+    def _format_also_reported_markdown(self, news: Dict) -> str:
+        """
+        生成"也见于"来源行（近似重复的其他来源），没有时返回空字符串
+        """
+        sources = news.get('also_reported_by') or []
+        if not sources:
+            return ""
+        links = [f"[{source.get('category') or source.get('title', '')}]({source.get('url', '')})" for source in sources]
+        return f"**也见于**: {'、'.join(links)}\n\n"
+
+    def _format_also_reported_html(self, news: Dict) -> str:
+        """
+        生成HTML格式的"也见于"来源行
+        """
+        import html
+
+        sources = news.get('also_reported_by') or []
+        if not sources:
+            return ""
+        links = []
+        for source in sources:
+            label = html.escape(source.get('category') or source.get('title', ''))
+            url = source.get('url', '')
+            if url.startswith(('http://', 'https://')):
+                links.append(f'<a href="{html.escape(url, quote=True)}" target="_blank">{label}</a>')
+            else:
+                links.append(label)
+        return f'        <div class="meta"><strong>也见于:</strong> {"、".join(links)}</div>\n'
+
     def save_markdown(self, markdown_content: str, date: str = None) -> str:
         """
         保存Markdown文件
@@ -286,6 +316,7 @@ class OutputFormatter:
             html_content += f'<strong>类别:</strong> {category} | '
             html_content += f'<strong>原文链接:</strong> <a href="{url}" target="_blank">点击访问</a>'
             html_content += f'</div>\n'
+            html_content += self._format_also_reported_html(news)
 
             if news.get('processing_status') == 'success':
                 # 将Markdown转换为简单的HTML
@@ -0,0 +1,137 @@
+"""
+流水线模块
+抓取与AI处理并行：抓取线程把新闻放入有界队列，AI处理在主线程中边取边处理
+"""
+
+import logging
+import queue
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import config
+from ai_processor import AIProcessor
+from checkpoint import RunJournal, news_key
+from dedup import NewsDeduplicator
+from news_scraper import NewsScraper
+
+# 队列结束标记
+_DONE = object()
+
+
+class NewsPipeline:
+    """抓取 -> 去重 -> AI处理 的生产者/消费者流水线"""
+
+    def __init__(self, scraper: NewsScraper, processor: AIProcessor, queue_size: int = None,
+                 journal: Optional[RunJournal] = None, resume: bool = False):
+        """
+        Args:
+            scraper: 新闻来源（NewsScraper，或合并分片时的ShardReader），需提供iter_all()
+            processor: AI处理器
+            queue_size: 抓取与处理之间的队列长度
+            journal: 运行日志，记录每条新闻的抓取和处理结果
+            resume: 是否从journal中恢复：先重放已抓取的新闻，已处理成功的新闻不再调用模型
+        """
+        self.logger = logging.getLogger(__name__)
+        self.scraper = scraper
+        self.processor = processor
+        self.journal = journal
+        self._replay_items: List[Dict] = []
+        self._finished: Dict[str, Dict] = {}
+        if journal and resume:
+            self._replay_items, self._finished = journal.load()
+        if queue_size is None:
+            queue_size = getattr(config, "PIPELINE_QUEUE_SIZE", 10)
+        # 有界队列：AI处理跟不上时抓取线程阻塞，内存占用保持有界
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, queue_size))
+        # 入队的条目由AI处理线程读取，之后合并进来的重复条目只记录在去重器的旁路表中
+        self._deduplicator = NewsDeduplicator(defer_merges=True)
+        self.error = None
+        self.scraped_count = 0
+        self.unique_count = 0
+        self.resumed_count = 0
+
+    def _produce(self) -> None:
+        """
+        抓取线程：逐条抓取、去重，新条目放入队列
+        """
+        deduplicator = self._deduplicator
+        try:
+            # 续跑时先重放检查点中已抓取的新闻，重新抓取到的相同新闻会被去重合并
+            for item in self._replay_items:
+                if deduplicator.add(item):
+                    self.unique_count += 1
+                    self._queue.put(item)
+
+            for item in self.scraper.iter_all():
+                self.scraped_count += 1
+                if deduplicator.add(item):
+                    self.unique_count += 1
+                    if self.journal:
+                        self.journal.record_scraped(item)
+                    self._queue.put(item)
+        except Exception as e:
+            self.error = e
+            self.logger.exception(f"抓取线程出错: {e}")
+        finally:
+            self.logger.info(
+                f"抓取结束: {self.scraped_count} 条，去重后 {self.unique_count} 条"
+                f"（合并 {deduplicator.duplicate_count} 条重复，{deduplicator.near_duplicate_count} 条近似重复）"
+            )
+            self._queue.put(_DONE)
+
+    def _consume(self) -> Iterator[Dict]:
+        while True:
+            item = self._queue.get()
+            if item is _DONE:
+                return
+            yield item
+
+    def run(self) -> Tuple[List[Dict], List[Dict]]:
+        """
+        运行流水线
+
+        抓取线程意外出错时，已抓取的条目仍会处理完，错误记录在error属性中。
+
+        Returns:
+            (去重后的原始新闻列表, 处理结果列表)，两者顺序一致
+        """
+        producer = threading.Thread(target=self._produce, name="news-scraper", daemon=True)
+        producer.start()
+
+        raw_items: List[Dict] = []
+        processed_items: List[Optional[Dict]] = []
+        pending_positions: List[int] = []
+
+        def pending() -> Iterator[Dict]:
+            """按到达顺序登记条目；检查点中已处理的直接复用结果，其余交给AI处理"""
+            for item in self._consume():
+                position = len(raw_items)
+                raw_items.append(item)
+                processed_items.append(None)
+                finished = self._finished.get(news_key(item))
+                if finished:
+                    processed_items[position] = finished
+                    self.resumed_count += 1
+                    continue
+                pending_positions.append(position)
+                yield item
+
+        for index, result in enumerate(self.processor.iter_process(pending())):
+            position = pending_positions[index]
+            processed_items[position] = result
+            if self.journal and result.get('processing_status') == 'success':
+                self.journal.record_processed(raw_items[position], result)
+
+        producer.join()
+        if self.resumed_count:
+            self.logger.info(f"从检查点恢复 {self.resumed_count} 条已处理的新闻")
+
+        # 处理结束后写回合并的类别和来源，并同步到处理结果（类别按处理时的规则清理和截断）
+        self._deduplicator.apply_merges()
+        for raw, processed in zip(raw_items, processed_items):
+            if raw.get('category'):
+                processed['original_category'] = self.processor._sanitize_input(raw['category'], max_length=50)
+            if raw.get('also_reported_by'):
+                processed['also_reported_by'] = raw['also_reported_by']
+
+        return raw_items, processed_items
@@ -0,0 +1,130 @@
+"""
+请求限速模块
+按主机的令牌桶限速，并可遵循robots.txt中的Crawl-delay
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+
+class TokenBucket:
+    """线程安全的令牌桶"""
+
+    def __init__(self, rate: float, burst: float):
+        """
+        Args:
+            rate: 每秒补充的令牌数
+            burst: 桶容量（允许的突发请求数）
+        """
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        预订一个令牌
+
+        Returns:
+            需要等待的秒数（0表示可立即发送）
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+class HostRateLimiter:
+    """
+    按主机的请求调度器
+
+    每个主机一个令牌桶：空闲主机的请求立即发出，繁忙主机按速率排队。
+    robots.txt声明了Crawl-delay时，该主机的速率不超过1/Crawl-delay且不允许突发。
+    """
+
+    def __init__(self, rate: float, burst: float, user_agent: str = "*",
+                 robots_fetcher: Optional[Callable[[str], Optional[str]]] = None):
+        """
+        Args:
+            rate: 每个主机每秒的请求数，<=0表示不限速
+            burst: 每个主机允许的突发请求数
+            user_agent: 查询Crawl-delay时使用的User-Agent
+            robots_fetcher: 获取robots.txt文本的函数（参数为robots.txt的URL，失败返回None），
+                为None时不读取robots.txt
+        """
+        self.logger = logging.getLogger(__name__)
+        self.rate = rate
+        self.burst = burst
+        self.user_agent = user_agent
+        self.robots_fetcher = robots_fetcher
+        self._buckets: Dict[str, Optional[TokenBucket]] = {}
+        self._host_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, url: str) -> None:
+        """
+        等待直到允许向URL所属主机发送请求
+        """
+        bucket = self._bucket_for(url)
+        if bucket is None:
+            return
+        wait = bucket.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    def _bucket_for(self, url: str) -> Optional[TokenBucket]:
+        parts = urlparse(url)
+        host = parts.netloc.lower()
+        with self._lock:
+            if host in self._buckets:
+                return self._buckets[host]
+            host_lock = self._host_locks.setdefault(host, threading.Lock())
+
+        # 每个主机只读取一次robots.txt，其他线程等待结果
+        with host_lock:
+            with self._lock:
+                if host in self._buckets:
+                    return self._buckets[host]
+
+            rate, burst = self.rate, self.burst
+            crawl_delay = self._crawl_delay(f"{parts.scheme or 'https'}://{parts.netloc}/robots.txt")
+            if crawl_delay:
+                rate = 1.0 / crawl_delay if rate <= 0 else min(rate, 1.0 / crawl_delay)
+                burst = 1
+                self.logger.info(f"遵循robots.txt的Crawl-delay={crawl_delay}秒: {host}")
+
+            bucket = TokenBucket(rate, burst) if rate > 0 else None
+            with self._lock:
+                self._buckets[host] = bucket
+            return bucket
+
+    def _crawl_delay(self, robots_url: str) -> Optional[float]:
+        """
+        读取robots.txt中的Crawl-delay，未声明或读取失败时返回None
+        """
+        if not self.robots_fetcher:
+            return None
+
+        text = self.robots_fetcher(robots_url)
+        if not text:
+            return None
+
+        parser = RobotFileParser()
+        parser.parse(text.splitlines())
+        delay = parser.crawl_delay(self.user_agent)
+        if delay is None:
+            delay = parser.crawl_delay("*")
+        try:
+            delay = float(delay) if delay is not None else None
+        except (TypeError, ValueError):
+            return None
+        return delay if delay and delay > 0 else None
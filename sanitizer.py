@@ -0,0 +1,128 @@
+"""
+输入清理模块
+移除提示注入常用的指令片段和控制字符，结果与逐条re.sub的实现一致，但耗时与文本长度成线性关系
+"""
+
+import re
+from typing import List, Pattern, Tuple
+
+REPLACEMENT = '[内容已清理]'
+
+# 依次执行的清理规则（与原来的8条正则等价）：
+# ("chain", [A, B, C]) 等价于 A.*B.*C（贪婪，不跨行）
+# ("regex", pattern)   直接用正则替换（本身是线性的）
+# ("comment", None)    等价于 <!--.*?-->（非贪婪，不跨行）
+_RULES: List[Tuple[str, object]] = [
+    ("chain", [re.compile(r'(?i)ignore'), re.compile(r'(?i)previous'), re.compile(r'(?i)instructions?')]),
+    ("chain", [re.compile(r'(?i)override'), re.compile(r'(?i)system'), re.compile(r'(?i)prompt')]),
+    ("chain", [re.compile(r'(?i)you'), re.compile(r'(?i)are'), re.compile(r'(?i)now')]),
+    ("chain", [re.compile(r'(?i)disregard'), re.compile(r'(?i)above')]),
+    ("regex", re.compile(r'(?i)system:\s*')),
+    ("regex", re.compile(r'(?i)assistant:\s*')),
+    ("regex", re.compile(r'(?i)user:\s*')),
+    ("comment", None),
+]
+
+# 预筛：每条规则匹配时必须出现的关键词（小写），与_RULES一一对应
+_RULE_KEYWORDS: List[Tuple[str, ...]] = [
+    ('ignore', 'previous', 'instruction'),
+    ('override', 'system', 'prompt'),
+    ('you', 'are', 'now'),
+    ('disregard', 'above'),
+    ('system:',),
+    ('assistant:',),
+    ('user:',),
+    ('<!--', '-->'),
+]
+
+# (?i)下与ASCII字母匹配、但str.lower()不会转成该字母的字符（İ、ı、ſ）
+_CASE_FOLD = {0x130: 'i', 0x131: 'i', 0x17f: 's'}
+
+_COMMENT_RE = re.compile(r'<!--')
+
+# 控制字符（保留换行符、回车符和制表符）
+_CONTROL_CHARS = {code: None for code in range(32) if chr(code) not in '\n\r\t'}
+
+
+def _sub_chain(line: str, parts: List[Pattern]) -> str:
+    """
+    替换单行中 parts[0].*parts[1].*...parts[-1] 的匹配
+
+    贪婪匹配的结果是：从第一个parts[0]开始，到最后一个parts[-1]结束；
+    中间各段只需确认按顺序存在，取最靠前的出现位置即可。
+    每行最多一处匹配（匹配结束后该行剩余部分不再含parts[-1]）。
+    """
+    first = parts[0].search(line)
+    if not first:
+        return line
+
+    pos = first.end()
+    for part in parts[1:-1]:
+        middle = part.search(line, pos)
+        if not middle:
+            return line
+        pos = middle.end()
+
+    last = None
+    for last in parts[-1].finditer(line, pos):
+        pass
+    if last is None:
+        return line
+    return line[:first.start()] + REPLACEMENT + line[last.end():]
+
+
+def _sub_comments(line: str) -> str:
+    """
+    替换单行中 <!--.*?--> 的匹配
+    """
+    pieces = []
+    pos = 0
+    while True:
+        start = line.find('<!--', pos)
+        if start < 0:
+            break
+        end = line.find('-->', start + 4)
+        if end < 0:
+            # 之后的<!--同样找不到结尾
+            break
+        pieces.append(line[pos:start])
+        pieces.append(REPLACEMENT)
+        pos = end + 3
+    if not pieces:
+        return line
+    pieces.append(line[pos:])
+    return ''.join(pieces)
+
+
+def _apply_per_line(text: str, trigger: Pattern, func, *args) -> str:
+    lines = text.split('\n')
+    for index, line in enumerate(lines):
+        if trigger.search(line):
+            lines[index] = func(line, *args)
+    return '\n'.join(lines)
+
+
+def sanitize_text(text: str, max_length: int) -> str:
+    """
+    截断到max_length，移除提示注入片段和控制字符，并去掉首尾空白
+    """
+    if not text:
+        return ""
+
+    if len(text) > max_length:
+        text = text[:max_length]
+
+    # 替换文本不含任何关键词，前面的规则不会为后面的规则制造新的匹配，预筛一次即可
+    folded = text.translate(_CASE_FOLD) if any(chr(code) in text for code in _CASE_FOLD) else text
+    folded = folded.lower()
+    for keywords, (kind, rule) in zip(_RULE_KEYWORDS, _RULES):
+        if not all(keyword in folded for keyword in keywords):
+            continue
+        if kind == "chain":
+            text = _apply_per_line(text, rule[0], _sub_chain, rule)
+        elif kind == "regex":
+            text = rule.sub(REPLACEMENT, text)
+        else:
+            text = _apply_per_line(text, _COMMENT_RE, _sub_comments)
+
+    return text.translate(_CONTROL_CHARS).strip()
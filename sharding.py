@@ -0,0 +1,88 @@
+"""
+分片抓取模块
+按稳定哈希把抓取任务（BBC类别和RSS源）分配到多个分片，各分片结果写入JSONL文件后再合并
+"""
+
+import hashlib
+import json
+import logging
+import os
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """
+    解析分片参数，格式为 "序号/总数"，序号从0开始，如 "0/4"
+
+    Raises:
+        ValueError: 格式错误或序号超出范围时抛出
+    """
+    try:
+        index, count = (int(part) for part in spec.split('/', 1))
+    except ValueError:
+        raise ValueError(f"分片格式应为 序号/总数（如 0/4）: {spec}")
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"分片序号应在 0 到 {count - 1} 之间: {spec}")
+    return index, count
+
+
+def shard_of(key: str, shard_count: int) -> int:
+    """
+    计算任务所属的分片（与进程、机器和Python哈希种子无关）
+    """
+    digest = hashlib.sha1(key.encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big') % shard_count
+
+
+def in_shard(key: str, shard: Tuple[int, int]) -> bool:
+    index, count = shard
+    return shard_of(key, count) == index
+
+
+def write_shard(path: str, items: Iterable[Dict]) -> int:
+    """
+    逐条写入分片结果（先写临时文件，完成后再替换，合并时不会读到写了一半的分片）
+
+    Returns:
+        写入的条数
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    count = 0
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        for item in items:
+            f.write(json.dumps(item, ensure_ascii=False) + '\n')
+            count += 1
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return count
+
+
+class ShardReader:
+    """
+    按顺序读取多个分片文件，提供与NewsScraper相同的iter_all接口，可直接交给流水线
+    """
+
+    def __init__(self, paths: List[str]):
+        self.logger = logging.getLogger(__name__)
+        self.paths = paths
+
+    def iter_all(self) -> Iterator[Dict]:
+        for path in self.paths:
+            if not os.path.exists(path):
+                self.logger.error(f"分片文件不存在，跳过: {path}")
+                continue
+            count = 0
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        item = json.loads(line)
+                    except ValueError:
+                        continue
+                    if isinstance(item, dict):
+                        count += 1
+                        yield item
+            self.logger.info(f"读取分片: {path}（{count}条）")
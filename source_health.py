@@ -0,0 +1,190 @@
+"""
+订阅源健康度模块
+持久化记录每个RSS源的耗时、流量、产出和失败情况，用于排序抓取、跳过长期失效的源
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# 每个源保留的最近耗时样本数
+LATENCY_SAMPLES = 20
+
+
+def _percentile(values: List[float], percent: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(percent / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class SourceHealthRegistry:
+    """订阅源健康度记录（JSON文件持久化）"""
+
+    def __init__(self, path: str, dead_after_failures: int = 5, dead_retry_hours: float = 24):
+        """
+        Args:
+            path: 记录文件路径
+            dead_after_failures: 连续失败多少次后视为失效
+            dead_retry_hours: 失效的源多久之后再尝试一次
+        """
+        self.logger = logging.getLogger(__name__)
+        self.path = path
+        self.dead_after_failures = max(1, dead_after_failures)
+        self.dead_retry_seconds = dead_retry_hours * 3600
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict] = self._load()
+        # 本进程更新过的源；保存时只覆盖这些源，分片并行运行时不会冲掉其他进程的记录
+        self._dirty = set()
+
+    def _load(self) -> Dict[str, Dict]:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"读取订阅源健康记录失败: {self.path} - {e}")
+            return {}
+
+    def save(self) -> None:
+        """
+        原子写入记录文件
+        """
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with self._lock:
+            merged = self._load()
+            merged.update({url: self._stats[url] for url in self._dirty})
+            self._stats = merged
+            data = json.dumps(self._stats, ensure_ascii=False, indent=2)
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            self.logger.warning(f"保存订阅源健康记录失败: {self.path} - {e}")
+
+    def _entry(self, url: str, name: str) -> Dict:
+        entry = self._stats.get(url)
+        if entry is None:
+            entry = {
+                'name': name,
+                'latencies': [],
+                'bytes': 0,
+                'items': 0,
+                'not_modified': 0,
+                'attempts': 0,
+                'successes': 0,
+                'consecutive_failures': 0,
+                'last_success': None,
+                'last_attempt': None,
+                'last_error': '',
+            }
+            self._stats[url] = entry
+        entry['name'] = name
+        self._dirty.add(url)
+        return entry
+
+    def record_success(self, url: str, name: str, latency: float, size: Optional[int], item_count: int,
+                       not_modified: bool = False) -> None:
+        """
+        记录一次成功抓取
+
+        Args:
+            size: 下载的响应体字节数；304或未下载响应体时传None，保留上次记录的大小
+            not_modified: 是否为条件请求命中（304）
+        """
+        with self._lock:
+            entry = self._entry(url, name)
+            now = time.time()
+            entry['latencies'] = (entry['latencies'] + [round(latency, 3)])[-LATENCY_SAMPLES:]
+            if size is not None:
+                entry['bytes'] = size
+            if not_modified:
+                entry['not_modified'] = entry.get('not_modified', 0) + 1
+            entry['items'] = item_count
+            entry['attempts'] += 1
+            entry['successes'] += 1
+            entry['consecutive_failures'] = 0
+            entry['last_success'] = now
+            entry['last_attempt'] = now
+            entry['last_error'] = ''
+
+    def record_failure(self, url: str, name: str, latency: float, error: str) -> None:
+        with self._lock:
+            entry = self._entry(url, name)
+            entry['latencies'] = (entry['latencies'] + [round(latency, 3)])[-LATENCY_SAMPLES:]
+            entry['attempts'] += 1
+            entry['consecutive_failures'] += 1
+            entry['last_attempt'] = time.time()
+            entry['last_error'] = error[:200]
+
+    def is_dead(self, url: str) -> bool:
+        """
+        判断源是否长期失效：连续失败达到阈值，且距上次尝试未超过重试间隔
+        """
+        with self._lock:
+            entry = self._stats.get(url)
+            if not entry or entry['consecutive_failures'] < self.dead_after_failures:
+                return False
+            return time.time() - (entry['last_attempt'] or 0) < self.dead_retry_seconds
+
+    def _priority(self, url: str) -> float:
+        """
+        抓取优先级（越小越先抓）：中位耗时除以产出条数，没有记录的源最先抓取
+        """
+        entry = self._stats.get(url)
+        if not entry or not entry['successes']:
+            return 0.0
+        p50 = _percentile(entry['latencies'], 50) or 0.0
+        return p50 / (1 + entry['items'])
+
+    def order(self, sources: List[Dict]) -> List[int]:
+        """
+        返回按抓取优先级排序的源下标（快速、产出多的源在前）
+        """
+        with self._lock:
+            return sorted(range(len(sources)), key=lambda i: self._priority(sources[i].get('url', '')))
+
+    def report(self) -> str:
+        """
+        生成健康度报告文本（按连续失败次数和耗时排序）
+        """
+        def fmt_time(timestamp):
+            return datetime.fromtimestamp(timestamp).strftime('%m-%d %H:%M') if timestamp else '-'
+
+        def fmt_seconds(value):
+            return f"{value:.2f}s" if value is not None else '-'
+
+        with self._lock:
+            rows = sorted(
+                self._stats.items(),
+                key=lambda kv: (-kv[1]['consecutive_failures'], -(_percentile(kv[1]['latencies'], 95) or 0))
+            )
+            lines = [
+                f"订阅源健康报告（共 {len(rows)} 个源）",
+                f"{'状态':<4} {'p50':>7} {'p95':>7} {'字节':>9} {'条数':>4} {'连败':>4} {'上次成功':<11} 名称",
+            ]
+            for url, entry in rows:
+                if entry['consecutive_failures'] >= self.dead_after_failures:
+                    status = '失效'
+                elif entry['consecutive_failures']:
+                    status = '异常'
+                else:
+                    status = '正常'
+                lines.append(
+                    f"{status:<4} {fmt_seconds(_percentile(entry['latencies'], 50)):>7} "
+                    f"{fmt_seconds(_percentile(entry['latencies'], 95)):>7} {entry['bytes']:>9} "
+                    f"{entry['items']:>4} {entry['consecutive_failures']:>4} {fmt_time(entry['last_success']):<11} "
+                    f"{entry['name']} <{url}>"
+                )
+        return '\n'.join(lines)
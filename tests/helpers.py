@@ -0,0 +1,71 @@
+"""
+测试和基准脚本共用的辅助函数
+"""
+
+import importlib.util
+import os
+import sys
+import xml.etree.ElementTree as ET
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def ensure_config():
+    """
+    保证可以import config：仓库根目录加入sys.path，没有config.py时使用config.example.py
+    """
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+    if "config" in sys.modules:
+        return sys.modules["config"]
+    try:
+        import config
+        return config
+    except ImportError:
+        spec = importlib.util.spec_from_file_location("config", os.path.join(REPO_ROOT, "config.example.py"))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["config"] = module
+        spec.loader.exec_module(module)
+        return module
+
+
+def make_scraper():
+    """
+    创建不读写磁盘缓存的NewsScraper
+    """
+    config = ensure_config()
+    from news_scraper import NewsScraper
+
+    switches = ("ENABLE_HTTP_CACHE", "ENABLE_SOURCE_HEALTH", "ENABLE_ARTICLE_CACHE")
+    saved = {name: getattr(config, name) for name in switches if hasattr(config, name)}
+    try:
+        for name in switches:
+            setattr(config, name, False)
+        return NewsScraper()
+    finally:
+        for name in switches:
+            if name in saved:
+                setattr(config, name, saved[name])
+            else:
+                delattr(config, name)
+
+
+def fixture_path(*parts: str) -> str:
+    return os.path.join(FIXTURES_DIR, *parts)
+
+
+def list_fixtures(subdir: str):
+    directory = fixture_path(subdir)
+    return sorted(os.path.join(directory, name) for name in os.listdir(directory))
+
+
+def iter_feed_entries(path: str):
+    """
+    按iter_rss_items的规则找出订阅源中的条目（根元素为feed时取entry，否则取item）
+    """
+    root = ET.parse(path).getroot()
+    entry_name = 'entry' if root.tag.rsplit('}', 1)[-1] == 'feed' else 'item'
+    for element in root.iter():
+        if element.tag.rsplit('}', 1)[-1] == entry_name:
+            yield element
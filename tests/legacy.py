@@ -0,0 +1,121 @@
+"""
+优化前的原始实现，作为等价性测试和基准测试的参照（不要修改其行为）
+"""
+
+import re
+import xml.etree.ElementTree as ET
+from typing import List
+
+from bs4 import BeautifulSoup
+
+
+def get_xml_text_by_suffix(element: ET.Element, suffixes: List[str]) -> str:
+    """
+    原NewsScraper._get_xml_text_by_suffix
+    """
+    for child in element.iter():
+        for suffix in suffixes:
+            if child.tag.endswith(suffix):
+                text = ''.join(child.itertext()).strip()
+                if text:
+                    return text
+    return ""
+
+
+def get_xml_link(element: ET.Element) -> str:
+    """
+    原NewsScraper._get_xml_link
+    """
+    fallback_link = ""
+    for child in element.iter():
+        if child.tag.endswith('link'):
+            href = child.attrib.get('href')
+            if href:
+                rel = child.attrib.get('rel', 'alternate')
+                if rel == 'alternate':
+                    return href.strip()
+                if not fallback_link:
+                    fallback_link = href.strip()
+            if child.text:
+                if not fallback_link:
+                    fallback_link = child.text.strip()
+    return fallback_link
+
+
+def extract_entry_fields(entry: ET.Element):
+    """
+    原parse_rss_items中提取标题、链接和原始摘要的三次查找
+    """
+    title = get_xml_text_by_suffix(entry, ["title"])
+    link = get_xml_link(entry)
+    summary_raw = get_xml_text_by_suffix(entry, ["summary", "description", "content", "encoded"])
+    return title, link, summary_raw
+
+
+def clean_text(text: str) -> str:
+    """
+    原NewsScraper._clean_text（每条文本都构建BeautifulSoup）
+    """
+    if not text:
+        return ""
+    return BeautifulSoup(text, 'html.parser').get_text(' ', strip=True)
+
+
+def sanitize_input(text: str, max_length: int = 1000) -> str:
+    """
+    原AIProcessor._sanitize_input（逐条re.sub的8条规则）
+    """
+    if not text:
+        return ""
+
+    if len(text) > max_length:
+        text = text[:max_length]
+
+    dangerous_patterns = [
+        r'(?i)ignore.*previous.*instructions?',
+        r'(?i)override.*system.*prompt',
+        r'(?i)you.*are.*now',
+        r'(?i)disregard.*above',
+        r'(?i)system:\s*',
+        r'(?i)assistant:\s*',
+        r'(?i)user:\s*',
+        r'<!--.*?-->',
+    ]
+
+    for pattern in dangerous_patterns:
+        text = re.sub(pattern, '[内容已清理]', text)
+
+    text = ''.join(char for char in text if ord(char) >= 32 or char in '\n\r\t')
+
+    return text.strip()
+
+
+class BandedSimHashIndex:
+    """
+    原dedup.SimHashIndex：指纹切为max_distance + 1段，每段一张表（增加了比较次数统计）
+    """
+
+    def __init__(self, max_distance: int):
+        self.max_distance = max_distance
+        self.comparisons = 0
+        band_count = max_distance + 1
+        band_width = 64 // band_count
+        self._bands = []
+        for band in range(band_count):
+            start = band * band_width
+            width = band_width if band < band_count - 1 else 64 - start
+            self._bands.append((start, (1 << width) - 1))
+        self._buckets = [{} for _ in self._bands]
+
+    def find(self, fingerprint: int):
+        for (start, mask), buckets in zip(self._bands, self._buckets):
+            candidates = buckets.get(fingerprint >> start & mask, ())
+            self.comparisons += len(candidates)
+            for candidate_fp, value in candidates:
+                if bin(candidate_fp ^ fingerprint).count('1') <= self.max_distance:
+                    return value
+        return None
+
+    def add(self, fingerprint: int, value) -> None:
+        for (start, mask), buckets in zip(self._bands, self._buckets):
+            buckets.setdefault(fingerprint >> start & mask, []).append((fingerprint, value))
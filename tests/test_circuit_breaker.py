@@ -0,0 +1,59 @@
+"""
+主机熔断测试
+"""
+
+import pytest
+import requests
+
+import config
+from circuit_breaker import CircuitOpenError, HostCircuitBreaker
+from helpers import make_scraper
+
+URL = "https://feed.example.com/rss"
+
+
+class OkResponse:
+    status_code = 200
+    headers = {'Content-Type': 'text/plain'}
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size=1):
+        yield b"ok"
+
+    def close(self):
+        pass
+
+
+def test_probe_error_does_not_leave_host_probing(monkeypatch):
+    monkeypatch.setattr(config, "MAX_RETRIES", 1)
+    monkeypatch.setattr(config, "HOST_RATE_LIMIT", 0)
+    monkeypatch.setattr(config, "RESPECT_ROBOTS_CRAWL_DELAY", False)
+    scraper = make_scraper()
+    scraper.circuit_breaker = HostCircuitBreaker(failure_threshold=1, cooldown_seconds=0)
+    outcomes = iter([requests.ConnectionError("down"), ValueError("bad redirect"), None])
+
+    def fake_get(url, **kwargs):
+        outcome = next(outcomes)
+        if outcome is not None:
+            raise outcome
+        return OkResponse()
+
+    monkeypatch.setattr(scraper.session, "get", fake_get)
+
+    with pytest.raises(requests.ConnectionError):
+        scraper._request(URL)
+    # 冷却结束后的探测请求抛出非requests异常
+    with pytest.raises(ValueError):
+        scraper._request(URL)
+    # 探测失败后重新熔断，冷却结束后仍能再次探测
+    assert isinstance(scraper._request(URL), OkResponse)
+
+
+def test_breaker_blocks_second_probe():
+    breaker = HostCircuitBreaker(failure_threshold=1, cooldown_seconds=0)
+    breaker.record_failure(URL)
+    breaker.before_request(URL)
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request(URL)
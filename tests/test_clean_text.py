@@ -0,0 +1,67 @@
+"""
+NewsScraper._clean_text快速路径与BeautifulSoup(html.parser).get_text(' ', strip=True)的等价性测试
+"""
+
+import html.entities
+import json
+import random
+
+import pytest
+
+import legacy
+from helpers import fixture_path, make_scraper
+
+# 语料中含XML声明，BeautifulSoup会提示"XML按HTML解析"，与本测试无关
+pytestmark = pytest.mark.filterwarnings("ignore::bs4.XMLParsedAsHTMLWarning")
+
+with open(fixture_path("summaries.jsonl"), encoding="utf-8") as f:
+    CORPUS = [json.loads(line) for line in f if line.strip()]
+
+# 随机组合的片段：标签、实体（含缺少分号、未知名称、无效码点等）、尖括号和普通文本
+TOKENS = [
+    "<p>", "</p>", "<b>", "</b>", "<br>", "<br/>", "<a href='x?a=1&b=2'>", "</a>", "<img alt=\"a>b\">",
+    "<p attr=\"", "<p attr='x'>", "\"", "'", "<p\nclass=x>", "</ p>", "<a b=c d>",
+    "<div class=x>", "</div>", "<!--", "-->", "<script>", "</script>", "<![CDATA[", "]]>", "<title>",
+    "&amp;", "&amp", "&ampx", "&lt;", "&gt", "&copy", "&copy;", "&copy2023", "&nbsp;", "&nbsp", "&hellip",
+    "&hellip;", "&HELLIP;", "&notit;", "&notin;", "&foo;", "&eacute", "&#39;", "&#169", "&#x41;", "&#X41;",
+    "&#127;", "&#1;", "&#xFFFE;", "&#1114111;", "&#0;", "&#150;", "&#;", "&#", "&", "AT&T", ";", "#",
+    "<", ">", " ", "  ", "\n", "\t", "text", "Word", "2023", "中文", "é", "x",
+]
+
+
+def random_markup(rng: random.Random) -> str:
+    return ''.join(rng.choice(TOKENS) for _ in range(rng.randint(0, 12)))
+
+
+@pytest.fixture(scope="module")
+def scraper():
+    return make_scraper()
+
+
+def test_corpus_matches_beautifulsoup(scraper):
+    mismatches = [
+        (text, scraper._clean_text(text), legacy.clean_text(text))
+        for text in CORPUS
+        if scraper._clean_text(text) != legacy.clean_text(text)
+    ]
+    assert not mismatches
+
+
+def test_randomized_markup_matches_beautifulsoup(scraper):
+    rng = random.Random(20240610)
+    for _ in range(20000):
+        text = random_markup(rng)
+        assert scraper._clean_text(text) == legacy.clean_text(text), repr(text)
+
+
+def test_named_entities_match_beautifulsoup(scraper):
+    for name in html.entities.html5:
+        for text in (f"<p>x &{name} y</p>", f"x &{name}y"):
+            assert scraper._clean_text(text) == legacy.clean_text(text), repr(text)
+
+
+def test_numeric_references_match_beautifulsoup(scraper):
+    for codepoint in [*range(0, 0x200), *range(0xd7f0, 0xe010), *range(0xfdc0, 0xfe00), *range(0xfff0, 0x10010),
+                      0x1fffe, 0x1ffff, 0x10fffe, 0x10ffff]:
+        for text in (f"a &#{codepoint}; b", f"a &#x{codepoint:x}; b"):
+            assert scraper._clean_text(text) == legacy.clean_text(text), repr(text)
@@ -0,0 +1,115 @@
+"""
+新闻去重测试
+"""
+
+import random
+
+import pytest
+
+from dedup import SIMHASH_BITS, NewsDeduplicator, SimHashIndex
+
+WIRE_STORY = (
+    "Rescue teams on Tuesday reached a remote mountain village that had been cut off for three days "
+    "after heavy rain triggered a landslide, officials said, adding that more than two hundred residents "
+    "were safe but roads and power lines remained badly damaged across the region"
+)
+
+
+def make_item(url, category, title, content):
+    return {'url': url, 'category': category, 'title': title, 'content': content, 'summary': content[:80]}
+
+
+def test_url_variant_of_near_duplicate_does_not_touch_representative():
+    deduplicator = NewsDeduplicator()
+    a = make_item("https://a.example.com/story", "A", "Rescuers reach village", WIRE_STORY)
+    b = make_item("https://b.example.com/story", "B", "Village reached by rescuers", WIRE_STORY + " on Tuesday")
+    c = make_item("https://c.example.com/other", "C", "Unrelated", "Markets rally as inflation cools " * 10)
+    b_variant = make_item("https://b.example.com/story?utm_source=x", "D", "Village reached by rescuers",
+                          WIRE_STORY + " on Tuesday, with many more details from the other outlet")
+
+    assert [deduplicator.add(item) for item in (a, b, c, b_variant)] == [True, False, True, False]
+
+    assert a['categories'] == ['A']
+    assert a['category'] == "A"
+    assert a['content'] == WIRE_STORY
+    assert a['also_reported_by'] == [
+        {'title': "Village reached by rescuers", 'url': "https://b.example.com/story", 'category': "B / D"},
+    ]
+    assert deduplicator.near_duplicate_count == 1
+    assert deduplicator.duplicate_count == 1
+
+
+def test_url_duplicate_merges_into_first_item():
+    deduplicator = NewsDeduplicator()
+    first = make_item("https://a.example.com/story", "World", "Title", "short")
+    second = make_item("https://a.example.com/story?utm_medium=rss", "Asia", "Title", "a longer body")
+
+    assert deduplicator.add(first) is True
+    assert deduplicator.add(second) is False
+    assert first['categories'] == ["World", "Asia"]
+    assert first['content'] == "a longer body"
+
+
+def test_deferred_merges_leave_queued_items_untouched():
+    deduplicator = NewsDeduplicator(defer_merges=True)
+    first = make_item("https://a.example.com/story", "World", "Title", WIRE_STORY)
+    near = make_item("https://b.example.com/story", "B", "Other title", WIRE_STORY + " on Tuesday")
+    second = make_item("https://a.example.com/story?utm_medium=rss", "Asia", "Title", WIRE_STORY + " and more")
+    assert deduplicator.add(first) is True
+    snapshot = {key: (list(value) if isinstance(value, list) else value) for key, value in first.items()}
+
+    assert deduplicator.add(near) is False
+    assert deduplicator.add(second) is False
+    assert first == snapshot
+
+    assert deduplicator.apply_merges() == 1
+    assert first['categories'] == ["World", "Asia"]
+    assert first['category'] == "World / Asia"
+    assert first['content'] == WIRE_STORY + " and more"
+    assert [source['url'] for source in first['also_reported_by']] == ["https://b.example.com/story"]
+
+
+def flip_bits(fingerprint, count, rng):
+    for bit in rng.sample(range(SIMHASH_BITS), count):
+        fingerprint ^= 1 << bit
+    return fingerprint
+
+
+@pytest.mark.parametrize("max_distance, tables", [(3, 4), (6, 28)])
+def test_simhash_index_matches_brute_force(max_distance, tables):
+    rng = random.Random(max_distance)
+    index = SimHashIndex(max_distance)
+    stored = []
+    # max_distance为6时条目数超过第一次重建的阈值，抽查重建前后的查找结果
+    for number in range(4000):
+        planted = stored and rng.random() < 0.3
+        if planted:
+            fingerprint = flip_bits(rng.choice(stored), rng.randint(0, max_distance + 2), rng)
+        else:
+            fingerprint = rng.getrandbits(SIMHASH_BITS)
+        found = index.find(fingerprint)
+        if planted or number % 10 == 0:
+            expected = any(bin(fp ^ fingerprint).count('1') <= max_distance for fp in stored)
+            if expected:
+                assert found is not None and bin(found ^ fingerprint).count('1') <= max_distance
+            else:
+                assert found is None
+        index.add(fingerprint, fingerprint)
+        stored.append(fingerprint)
+    assert len(index._tables) == tables
+
+
+def test_simhash_index_comparisons_grow_subquadratically():
+    rng = random.Random(7)
+    comparisons = {}
+    for size in (1000, 4000, 16000):
+        index = SimHashIndex(6)
+        for _ in range(size):
+            fingerprint = rng.getrandbits(SIMHASH_BITS)
+            index.find(fingerprint)
+            index.add(fingerprint, None)
+        comparisons[size] = index.comparisons
+
+    # 每次查找的平均比较次数不随条目数增长（平方增长时16倍条目对应256倍比较次数）
+    assert comparisons[16000] / comparisons[1000] < 32
+    assert comparisons[16000] / 16000 < 20
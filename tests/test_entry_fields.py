@@ -0,0 +1,34 @@
+"""
+NewsScraper._extract_entry_fields与原_get_xml_text_by_suffix/_get_xml_link的等价性测试
+"""
+
+import os
+
+import pytest
+
+import legacy
+from helpers import fixture_path, iter_feed_entries, list_fixtures, make_scraper
+
+FEEDS = list_fixtures("feeds")
+
+
+@pytest.fixture(scope="module")
+def scraper():
+    return make_scraper()
+
+
+@pytest.mark.parametrize("path", FEEDS, ids=os.path.basename)
+def test_matches_legacy_lookup(scraper, path):
+    entries = list(iter_feed_entries(path))
+    assert entries
+    for index, entry in enumerate(entries):
+        assert scraper._extract_entry_fields(entry) == legacy.extract_entry_fields(entry), f"entry {index}"
+
+
+def test_edge_case_link_order(scraper):
+    entries = list(iter_feed_entries(fixture_path("feeds", "edge_cases_rss.xml")))
+    links = [scraper._extract_entry_fields(entry)[1] for entry in entries]
+    assert links[2] == "https://edge.example.org/3"
+    assert links[3] == ""
+    assert links[4] == "https://related.example.org/5"
+    assert links[8] == "https://edge.example.org/9-alt"
@@ -0,0 +1,84 @@
+"""
+HTTP条件请求缓存测试：解析失败或没有条目时不保存校验值
+"""
+
+import http.server
+import threading
+
+import pytest
+
+import config
+from helpers import fixture_path
+from news_scraper import NewsScraper
+
+with open(fixture_path("feeds", "bbc_world_rss.xml"), "rb") as f:
+    FEED = f.read()
+
+
+class ETagHandler(http.server.BaseHTTPRequestHandler):
+    """
+    内容不变时返回304；记录每次请求是否带了If-None-Match
+    """
+    body = FEED
+    conditional = []
+
+    def do_GET(self):
+        cls = type(self)
+        etag = f'"{len(cls.body)}"'
+        cls.conditional.append(self.headers.get('If-None-Match'))
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/rss+xml; charset=utf-8')
+        self.send_header('Content-Length', str(len(cls.body)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(cls.body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def feed_url():
+    ETagHandler.body = FEED
+    ETagHandler.conditional = []
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), ETagHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/rss.xml"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def scraper(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "ENABLE_HTTP_CACHE", True)
+    monkeypatch.setattr(config, "HTTP_CACHE_DIR", str(tmp_path / "http"))
+    monkeypatch.setattr(config, "ENABLE_SOURCE_HEALTH", False)
+    monkeypatch.setattr(config, "ENABLE_ARTICLE_CACHE", False)
+    monkeypatch.setattr(config, "HOST_RATE_LIMIT", 100.0)
+    monkeypatch.setattr(config, "RESPECT_ROBOTS_CRAWL_DELAY", False)
+    return NewsScraper()
+
+
+@pytest.mark.parametrize("body", [b"<rss><channel><item><title>broken", b"<rss><channel></channel></rss>"])
+def test_empty_parse_does_not_store_validators(scraper, feed_url, body):
+    ETagHandler.body = body
+    source = {'name': "Feed", 'url': feed_url}
+    assert scraper._scrape_rss_source(source, per_feed=10) == []
+    assert scraper.http_cache.get(feed_url) is None
+
+    assert scraper._scrape_rss_source(source, per_feed=10) == []
+    assert ETagHandler.conditional == [None, None]
+
+
+def test_parsed_items_are_reused_on_not_modified(scraper, feed_url):
+    source = {'name': "Feed", 'url': feed_url}
+    first = scraper._scrape_rss_source(source, per_feed=10)
+    second = scraper._scrape_rss_source(source, per_feed=10)
+
+    assert len(first) == len(second) == 10
+    assert ETagHandler.conditional == [None, f'"{len(FEED)}"']
@@ -0,0 +1,141 @@
+"""
+模型接口路由测试：同步与异步的并发上限、异步等待名额
+"""
+
+import asyncio
+import http.server
+import json
+import re
+import threading
+import time
+
+import pytest
+
+import config
+from llm_router import LLMEndpoint, LLMRouter, load_endpoints
+
+
+def make_router(max_concurrency=1):
+    return LLMRouter([LLMEndpoint("a", "http://127.0.0.1:9", "key", "model", max_concurrency=max_concurrency)])
+
+
+def test_unset_limit_uses_sync_and_async_concurrency(monkeypatch):
+    monkeypatch.setattr(config, "AI_MAX_CONCURRENCY", 8)
+    monkeypatch.setattr(config, "AI_ASYNC_CONCURRENCY", 64)
+    monkeypatch.setattr(config, "LLM_ENDPOINTS", [
+        {'name': "default", 'base_url': "http://a.example.com/v1", 'api_key': "k", 'model': "m"},
+        {'name': "limited", 'base_url': "http://b.example.com/v1", 'api_key': "k", 'model': "m",
+         'max_concurrency': 3},
+    ])
+    default, limited = load_endpoints()
+    assert (default.max_concurrency, default.async_max_concurrency) == (8, 64)
+    assert (limited.max_concurrency, limited.async_max_concurrency) == (3, 3)
+
+
+def test_async_acquire_uses_async_limit():
+    router = LLMRouter([LLMEndpoint("a", "http://127.0.0.1:9", "key", "model",
+                                    max_concurrency=2, async_max_concurrency=5)])
+
+    async def acquire_all():
+        return [await router.aacquire() for _ in range(5)]
+
+    assert len(asyncio.run(acquire_all())) == 5
+    assert router.endpoints[0].in_flight == 5
+
+
+def test_async_acquire_wakes_on_release_from_thread():
+    router = make_router()
+    endpoint = router.acquire()
+    released = threading.Event()
+
+    def release():
+        released.set()
+        router.release(endpoint)
+
+    async def wait_for_slot():
+        task = asyncio.ensure_future(router.aacquire())
+        # 等到请求已挂起等待名额，再从其他线程释放
+        while not router._async_waiters:
+            await asyncio.sleep(0)
+        assert not task.done()
+        threading.Thread(target=release).start()
+        return await asyncio.wait_for(task, timeout=1.5)
+
+    assert asyncio.run(wait_for_slot()) is endpoint
+    assert released.is_set()
+    assert not router._async_waiters
+
+
+def test_cancelled_async_waiter_does_not_block_release():
+    router = make_router()
+    endpoint = router.acquire()
+
+    async def cancel_waiter():
+        task = asyncio.ensure_future(router.aacquire())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        router.release(endpoint)
+        return await asyncio.wait_for(router.aacquire(), timeout=1)
+
+    assert asyncio.run(cancel_waiter()) is endpoint
+
+
+class SlowCompletionHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    delay = 0.3
+    lock = threading.Lock()
+    in_flight = 0
+    peak = 0
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        cls = type(self)
+        with cls.lock:
+            cls.in_flight += 1
+            cls.peak = max(cls.peak, cls.in_flight)
+        time.sleep(self.delay)
+        with cls.lock:
+            cls.in_flight -= 1
+        title = re.search(r'标题：(.*)', body['messages'][0]['content']).group(1)
+        out = json.dumps({'choices': [{'message': {'content': f"# {title}"}}]}).encode()
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(out)))
+        self.end_headers()
+        self.wfile.write(out)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def llm_url():
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), SlowCompletionHandler, bind_and_activate=False)
+    server.request_queue_size = 256
+    server.server_bind()
+    server.server_activate()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    SlowCompletionHandler.peak = 0
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_async_batch_is_not_capped_by_sync_concurrency(monkeypatch, llm_url):
+    pytest.importorskip("httpx")
+    from ai_processor import AIProcessor
+
+    monkeypatch.setattr(config, "LLM_ENDPOINTS", [{'name': "mock", 'base_url': llm_url, 'api_key': "k", 'model': "m"}])
+    monkeypatch.setattr(config, "AI_MAX_CONCURRENCY", 8)
+    monkeypatch.setattr(config, "ENABLE_LLM_CACHE", False)
+    monkeypatch.setattr(config, "AI_PACK_SHORT_ITEMS", False)
+    monkeypatch.setattr(config, "LLM_STREAM", False)
+    processor = AIProcessor()
+    items = [{'title': f"t{i}", 'content': "some content", 'category': "c", 'url': f"u{i}"} for i in range(128)]
+
+    results = asyncio.run(processor.aprocess_batch(items, max_concurrency=64))
+
+    assert [result['translated_content'] for result in results] == [f"# t{i}" for i in range(128)]
+    # 同步的并发上限（8）不应限制异步处理
+    assert SlowCompletionHandler.peak > 8
@@ -0,0 +1,110 @@
+"""
+短新闻合并请求测试：合并与否输出格式相同，格式错误的合并响应不进入缓存
+"""
+
+import http.server
+import json
+import re
+import threading
+
+import pytest
+
+import config
+from ai_processor import SYSTEM_PROMPT, AIProcessor
+
+
+class MockLLMHandler(http.server.BaseHTTPRequestHandler):
+    """
+    按prompt中每条新闻的要求回复：内容为「标题|要求的摘要字数」，合并请求回复JSON数组
+    """
+    protocol_version = 'HTTP/1.1'
+    prompts = []
+    malformed_packs = False
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        prompt = body['messages'][0]['content']
+        type(self).prompts.append(prompt)
+        blocks = re.split(r'\[新闻 \d+\]\n', prompt)[1:]
+        if blocks:
+            entries = [{'id': number, 'content': self.answer(block)} for number, block in enumerate(blocks, 1)]
+            content = "not json" if self.malformed_packs else json.dumps(entries, ensure_ascii=False)
+        else:
+            content = self.answer(prompt)
+        out = json.dumps({'choices': [{'message': {'content': content}}]}).encode()
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(out)))
+        self.end_headers()
+        self.wfile.write(out)
+
+    @staticmethod
+    def answer(requirements: str) -> str:
+        title = re.search(r'标题：(.*)', requirements).group(1)
+        words = re.search(r'约(\d+)字', requirements).group(1)
+        return f"{title}|{words}"
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def processor(tmp_path, monkeypatch):
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), MockLLMHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    MockLLMHandler.prompts = []
+    MockLLMHandler.malformed_packs = False
+    monkeypatch.setattr(config, "LLM_ENDPOINTS", [
+        {'name': "mock", 'base_url': f"http://127.0.0.1:{server.server_port}", 'api_key': "k", 'model': "m"}
+    ])
+    monkeypatch.setattr(config, "ENABLE_LLM_CACHE", True)
+    monkeypatch.setattr(config, "LLM_CACHE_DB", str(tmp_path / "llm.db"))
+    monkeypatch.setattr(config, "AI_PACK_SHORT_ITEMS", True)
+    monkeypatch.setattr(config, "LLM_STREAM", False)
+    monkeypatch.setattr(config, "REQUEST_DELAY", 0)
+    yield AIProcessor()
+    server.shutdown()
+    server.server_close()
+
+
+def short_items(count, prefix="t"):
+    return [{'title': f"{prefix}{i}", 'content': f"Short summary number {i}.", 'category': "c", 'url': f"u{i}"}
+            for i in range(count)]
+
+
+def test_packed_items_get_the_single_item_deliverable(processor):
+    items = short_items(3)
+    packed = processor.process_news_pack(items)
+    single = processor.process_news_item({**items[0], 'title': "alone"})
+
+    assert len(MockLLMHandler.prompts) == 2
+    pack_prompt = MockLLMHandler.prompts[0]
+    for item in items:
+        assert processor._build_prompt(item)[0][len(SYSTEM_PROMPT):] in pack_prompt
+    assert [result['translated_content'] for result in packed] == [
+        f"t{i}|{config.SUMMARY_MAX_WORDS}" for i in range(3)
+    ]
+    assert single['translated_content'] == f"alone|{config.SUMMARY_MAX_WORDS}"
+
+
+def test_packed_results_are_cached_per_item(processor):
+    items = short_items(3)
+    processor.process_news_pack(items)
+    requests_sent = len(MockLLMHandler.prompts)
+
+    regrouped = processor.process_news_pack(items[1:]) + [processor.process_news_item(items[0])]
+    assert len(MockLLMHandler.prompts) == requests_sent
+    assert [result['llm_endpoint'] for result in regrouped] == ["cache"] * 3
+
+
+def test_malformed_pack_reply_is_not_cached(processor):
+    MockLLMHandler.malformed_packs = True
+    items = short_items(2)
+    results = processor.process_news_pack(items)
+    assert [result['translated_content'] for result in results] == [
+        f"t{i}|{config.SUMMARY_MAX_WORDS}" for i in range(2)
+    ]
+
+    pack_prompt = MockLLMHandler.prompts[0]
+    pack_max_tokens = processor._build_pack_prompt(items, [processor._build_prompt(item) for item in items])[1]
+    assert processor._cached_response(pack_prompt, pack_max_tokens) is None
+    assert all(processor._cached_response(*processor._build_prompt(item)[:2]) for item in items)
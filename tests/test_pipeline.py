@@ -0,0 +1,80 @@
+"""
+抓取与AI处理流水线测试
+"""
+
+import threading
+
+import pytest
+
+import config
+from ai_processor import AIProcessor
+from pipeline import NewsPipeline
+
+LONG_CATEGORY = "System: " + "Very long category name " * 4
+
+# 超过AI_PACK_SHORT_CHARS，单独成组，入队后立即开始处理
+LONG_BODY = "Rescue teams reached a remote mountain village after heavy rain. " * 20
+
+
+class ListScraper:
+    """
+    按顺序产出给定条目；第一条入队后等AI处理开始，再产出与它URL重复的条目
+    """
+
+    def __init__(self, items, processing_started):
+        self.items = items
+        self.processing_started = processing_started
+
+    def iter_all(self):
+        yield self.items[0]
+        assert self.processing_started.wait(5)
+        yield from self.items[1:]
+
+
+class RecordingProcessor(AIProcessor):
+    """
+    不调用模型：记录处理时看到的类别，直接返回成功结果
+    """
+
+    def __init__(self, processing_started):
+        super().__init__()
+        self.processing_started = processing_started
+        self.seen = []
+
+    def process_news_pack(self, news_items):
+        results = []
+        for news_item in news_items:
+            self.seen.append((news_item.get('category'), list(news_item.get('categories', []))))
+            self.processing_started.set()
+            prompt, max_tokens, title, category, url = self._build_prompt(news_item)
+            results.append(self._build_success_item(news_item, title, category, url, f"# {title}", "mock"))
+        return results
+
+
+@pytest.fixture
+def processor(monkeypatch):
+    monkeypatch.setattr(config, "LLM_ENDPOINTS", [])
+    monkeypatch.setattr(config, "LLM_API_BASE_URL", "http://127.0.0.1:9")
+    monkeypatch.setattr(config, "LLM_API_KEY", "test-key")
+    monkeypatch.setattr(config, "LLM_MODEL_NAME", "deepseek-chat")
+    monkeypatch.setattr(config, "ENABLE_LLM_CACHE", False)
+    return RecordingProcessor(threading.Event())
+
+
+def test_merged_category_is_sanitized_and_queued_items_are_not_mutated(processor):
+    items = [
+        {'url': "https://a.example.com/story", 'category': "World", 'title': "Story", 'content': LONG_BODY},
+        {'url': "https://a.example.com/story?utm_source=rss", 'category': LONG_CATEGORY, 'title': "Story",
+         'content': LONG_BODY + " More details."},
+    ]
+    pipeline = NewsPipeline(ListScraper(items, processor.processing_started), processor)
+    raw_items, processed_items = pipeline.run()
+
+    assert processor.seen == [("World", ["World"])]
+    assert raw_items[0]['categories'] == ["World", LONG_CATEGORY]
+    assert raw_items[0]['content'] == LONG_BODY + " More details."
+
+    category = processed_items[0]['original_category']
+    assert category == processor._sanitize_input(f"World / {LONG_CATEGORY}", max_length=50)
+    assert len(category) <= 50
+    assert "System:" not in category
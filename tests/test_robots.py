@@ -0,0 +1,84 @@
+"""
+robots.txt读取测试：超出大小或时间上限时按没有robots规则处理
+"""
+
+import http.server
+import threading
+import time
+
+import pytest
+
+import config
+import news_scraper
+from helpers import make_scraper
+
+ROBOTS = b"User-agent: *\nCrawl-delay: 5\n"
+PADDING = b"# " + b"x" * 1022 + b"\n"
+
+
+class RobotsHandler(http.server.BaseHTTPRequestHandler):
+    """
+    mode为normal时返回正常的robots.txt；oversize时在规则后追加约1MB注释（不带Content-Length）；
+    slow时逐行缓慢写出
+    """
+    mode = "normal"
+
+    def do_GET(self):
+        mode = type(self).mode
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain')
+        if mode == "normal":
+            self.send_header('Content-Length', str(len(ROBOTS)))
+        self.end_headers()
+        try:
+            self.wfile.write(ROBOTS)
+            if mode == "oversize":
+                for _ in range(1024):
+                    self.wfile.write(PADDING)
+            elif mode == "slow":
+                for _ in range(30):
+                    self.wfile.flush()
+                    time.sleep(0.1)
+                    self.wfile.write(PADDING)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        self.close_connection = True
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def robots_url():
+    RobotsHandler.mode = "normal"
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), RobotsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/robots.txt"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def scraper(monkeypatch):
+    monkeypatch.setattr(config, "HOST_RATE_LIMIT", 100.0)
+    monkeypatch.setattr(config, "RESPECT_ROBOTS_CRAWL_DELAY", True)
+    return make_scraper()
+
+
+def test_crawl_delay_is_read_from_robots(scraper, robots_url):
+    assert scraper._fetch_robots_txt(robots_url) == ROBOTS.decode()
+    assert scraper.rate_limiter._crawl_delay(robots_url) == 5
+
+
+def test_oversize_robots_counts_as_no_rules(scraper, robots_url):
+    RobotsHandler.mode = "oversize"
+    assert scraper._fetch_robots_txt(robots_url) is None
+    assert scraper.rate_limiter._crawl_delay(robots_url) is None
+
+
+def test_slow_robots_counts_as_no_rules(scraper, robots_url, monkeypatch):
+    monkeypatch.setattr(news_scraper, "ROBOTS_TXT_MAX_SECONDS", 0.3)
+    RobotsHandler.mode = "slow"
+    started = time.monotonic()
+    assert scraper._fetch_robots_txt(robots_url) is None
+    assert time.monotonic() - started < 2
@@ -0,0 +1,109 @@
+"""
+RSS流式下载和解析测试：读满条目数后停止下载，分块解码与整体解码结果一致
+"""
+
+import http.server
+import threading
+
+import pytest
+
+import config
+from helpers import make_scraper
+
+ITEM = (
+    "<item><title>Story {0}</title><link>https://news.example.com/{0}</link>"
+    "<description>Summary of story {0} with some padding text to make the item longer.</description></item>"
+)
+# 超过MAX_RESPONSE_BYTES中xml的上限（10MB）
+FEED = (
+    '<?xml version="1.0" encoding="utf-8"?><rss version="2.0"><channel><title>Big</title>'
+    + ''.join(ITEM.format(i) for i in range(80000))
+    + '</channel></rss>'
+).encode('utf-8')
+
+
+class EndlessFeedHandler(http.server.BaseHTTPRequestHandler):
+    """
+    不带Content-Length分块写出大订阅源，记录是否写完
+    """
+    finished = None
+    done = None
+
+    def do_GET(self):
+        cls = type(self)
+        try:
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/rss+xml; charset=utf-8')
+            self.end_headers()
+            for i in range(0, len(FEED), 16 * 1024):
+                self.wfile.write(FEED[i:i + 16 * 1024])
+            cls.finished = True
+        except (BrokenPipeError, ConnectionResetError):
+            cls.finished = False
+        finally:
+            cls.done.set()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def feed_url():
+    EndlessFeedHandler.finished = None
+    EndlessFeedHandler.done = threading.Event()
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), EndlessFeedHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/rss.xml"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def scraper(monkeypatch):
+    monkeypatch.setattr(config, "HOST_RATE_LIMIT", 100.0)
+    monkeypatch.setattr(config, "RESPECT_ROBOTS_CRAWL_DELAY", False)
+    return make_scraper()
+
+
+def test_stops_downloading_after_max_items(scraper, feed_url):
+    stats = {}
+    items = scraper._fetch_parsed(
+        feed_url,
+        lambda chunks, encoding: scraper.parse_rss_items(chunks, "Big", feed_url, 5, encoding),
+        stats=stats,
+        stream=True
+    )
+
+    assert [item['title'] for item in items] == [f"Story {i}" for i in range(5)]
+    assert stats['bytes'] < 1024 * 1024
+    assert EndlessFeedHandler.done.wait(10)
+    assert EndlessFeedHandler.finished is False
+
+
+def test_scrape_rss_source_streams_feed(scraper, feed_url):
+    items = scraper._scrape_rss_source({'name': "Big", 'url': feed_url}, per_feed=10)
+    assert len(items) == 10
+    assert EndlessFeedHandler.done.wait(10)
+    assert EndlessFeedHandler.finished is False
+
+
+@pytest.mark.parametrize("encoding", ["gbk", "iso-8859-1", "shift_jis"])
+def test_chunked_decoding_matches_whole_body(encoding):
+    scraper = make_scraper()
+    text = {
+        "gbk": "中文标题 {0}", "iso-8859-1": "Café résumé {0}", "shift_jis": "日本語のニュース {0}",
+    }[encoding]
+    feed = (
+        '<rss><channel>'
+        + ''.join(f"<item><title>{text.format(i)}</title><description>{text.format(i) * 20}</description></item>"
+                  for i in range(50))
+        + '</channel></rss>'
+    ).encode(encoding)
+
+    whole = scraper.parse_rss_items(feed, "Feed", "https://feed.example.com", 100, encoding)
+    streamed = scraper.parse_rss_items(
+        (feed[i:i + 7] for i in range(0, len(feed), 7)), "Feed", "https://feed.example.com", 100, encoding
+    )
+    assert len(whole) == 50
+    assert whole[0]['title'] == text.format(0)
+    assert streamed == whole
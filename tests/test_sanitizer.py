@@ -0,0 +1,66 @@
+"""
+sanitize_text与原来逐条re.sub实现的等价性测试，以及超长恶意输入的耗时测试
+"""
+
+import json
+import random
+import time
+
+import pytest
+
+import legacy
+from helpers import fixture_path
+from sanitizer import sanitize_text
+
+with open(fixture_path("sanitizer_inputs.jsonl"), encoding="utf-8") as f:
+    CORPUS = [json.loads(line) for line in f if line.strip()]
+
+# 随机组合的片段：各规则的关键词（含大小写和Unicode大小写折叠变体）、换行、控制字符
+TOKENS = [
+    "ignore", "IGNORE", "previous", "instruction", "instructions", "Instructionſ", "override", "system",
+    "System:", "prompt", "you", "YOU", "are", "now", "disregard", "above", "system:", "assistant:", "user:",
+    "USER:", "<!--", "-->", "<!-->", "\n", "\n", "\r", "\t", " ", " ", "  ", "x", "ſystem:", "\x00", "\x1f",
+    "\x7f", "é", "İ", "K", "yo", "u", "ser:", "-", "--", "<!", "<", ">", "s", ":", "ab", "ove",
+]
+
+# 会让原正则大量回溯的输入：(前缀, 重复片段)；前缀让规则的全部关键词都出现，预筛不会跳过
+ADVERSARIAL = {
+    "ignore previous": ("instructions ", "ignore previous "),
+    "you are": ("now ", "you are "),
+    "override system": ("prompt ", "override system "),
+    "disregard": ("above ", "disregard "),
+    "open comments": ("--> ", "<!-- "),
+}
+
+
+def adversarial(name: str, chars: int) -> str:
+    prefix, unit = ADVERSARIAL[name]
+    return (prefix + unit * (chars // len(unit) + 1))[:chars]
+
+
+@pytest.mark.parametrize("case", CORPUS, ids=lambda case: repr(case['text'][:30]))
+def test_corpus_matches_legacy(case):
+    assert sanitize_text(case['text'], case['max_length']) == legacy.sanitize_input(case['text'], case['max_length'])
+
+
+def test_randomized_inputs_match_legacy():
+    rng = random.Random(20240611)
+    for _ in range(20000):
+        text = ''.join(rng.choice(TOKENS) + rng.choice(['', ' ', '']) for _ in range(rng.randint(0, 25)))
+        max_length = rng.choice([1000, 30, 10])
+        assert sanitize_text(text, max_length) == legacy.sanitize_input(text, max_length), repr(text)
+
+
+@pytest.mark.parametrize("name", sorted(ADVERSARIAL))
+def test_adversarial_inputs_match_legacy(name):
+    # 原实现在这类输入上是多项式回溯，只比较2KB以内的长度
+    text = adversarial(name, 2000)
+    assert sanitize_text(text, len(text)) == legacy.sanitize_input(text, len(text))
+
+
+@pytest.mark.parametrize("name", sorted(ADVERSARIAL))
+def test_adversarial_100kb_input_is_linear(name):
+    text = adversarial(name, 100 * 1024)
+    started = time.perf_counter()
+    sanitize_text(text, len(text))
+    assert time.perf_counter() - started < 1.0
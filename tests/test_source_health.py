@@ -0,0 +1,81 @@
+"""
+订阅源健康度记录测试
+"""
+
+import http.server
+import json
+import threading
+
+import pytest
+
+import config
+from helpers import fixture_path
+from news_scraper import NewsScraper
+from source_health import SourceHealthRegistry
+
+with open(fixture_path("feeds", "bbc_world_rss.xml"), "rb") as f:
+    FEED = f.read()
+
+
+class ETagHandler(http.server.BaseHTTPRequestHandler):
+    etag = '"v1"'
+
+    def do_GET(self):
+        if self.headers.get('If-None-Match') == self.etag:
+            self.send_response(304)
+            self.send_header('ETag', self.etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/rss+xml; charset=utf-8')
+        self.send_header('Content-Length', str(len(FEED)))
+        self.send_header('ETag', self.etag)
+        self.end_headers()
+        self.wfile.write(FEED)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def feed_url():
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), ETagHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/rss.xml"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def scraper(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "ENABLE_HTTP_CACHE", True)
+    monkeypatch.setattr(config, "HTTP_CACHE_DIR", str(tmp_path / "http"))
+    monkeypatch.setattr(config, "ENABLE_SOURCE_HEALTH", True)
+    monkeypatch.setattr(config, "SOURCE_HEALTH_FILE", str(tmp_path / "source_health.json"))
+    monkeypatch.setattr(config, "ENABLE_ARTICLE_CACHE", False)
+    monkeypatch.setattr(config, "HOST_RATE_LIMIT", 100.0)
+    monkeypatch.setattr(config, "RESPECT_ROBOTS_CRAWL_DELAY", False)
+    return NewsScraper()
+
+
+def test_not_modified_keeps_downloaded_size(scraper, feed_url):
+    source = {'name': "BBC World", 'url': feed_url}
+    first = scraper._scrape_rss_source(source, per_feed=10)
+    second = scraper._scrape_rss_source(source, per_feed=10)
+    assert len(first) == len(second) == 10
+
+    scraper.source_health.save()
+    with open(scraper.source_health.path, encoding='utf-8') as f:
+        entry = json.load(f)[feed_url]
+    assert entry['bytes'] == len(FEED)
+    assert entry['not_modified'] == 1
+    assert entry['successes'] == 2
+
+
+def test_record_success_without_size_keeps_previous(tmp_path):
+    registry = SourceHealthRegistry(str(tmp_path / "health.json"))
+    registry.record_success("https://feed.example.com/rss", "Feed", 0.5, 2048, 12)
+    registry.record_success("https://feed.example.com/rss", "Feed", 0.1, None, 12, not_modified=True)
+    entry = registry._stats["https://feed.example.com/rss"]
+    assert entry['bytes'] == 2048
+    assert entry['not_modified'] == 1
@@ -0,0 +1,77 @@
+"""
+按token预算截断正文和设置max_tokens的测试
+"""
+
+import pytest
+
+import config
+from ai_processor import SYSTEM_PROMPT, AIProcessor
+from token_estimator import TokenEstimator
+
+PARAGRAPH = (
+    "Rescue teams on Tuesday reached a remote mountain village that had been cut off for three days "
+    "after heavy rain triggered a landslide, officials said. "
+)
+
+
+def article(chars: int) -> str:
+    return (PARAGRAPH * (chars // len(PARAGRAPH) + 1))[:chars]
+
+
+def make_processor(monkeypatch, model):
+    monkeypatch.setattr(config, "LLM_ENDPOINTS", [])
+    monkeypatch.setattr(config, "LLM_API_BASE_URL", "http://127.0.0.1:9")
+    monkeypatch.setattr(config, "LLM_API_KEY", "test-key")
+    monkeypatch.setattr(config, "LLM_MODEL_NAME", model)
+    monkeypatch.setattr(config, "ENABLE_LLM_CACHE", False)
+    return AIProcessor()
+
+
+def kept_content(prompt: str) -> str:
+    template = SYSTEM_PROMPT + config.TRANSLATION_PROMPT.format(
+        title="t", content="", summary_words=config.SUMMARY_MAX_WORDS
+    )
+    head, tail = template.split("正文：", 1)
+    return prompt[len(head) + len("正文："):len(prompt) - len(tail)]
+
+
+@pytest.mark.parametrize("model", ["deepseek-chat", "gpt-4o", "moonshot-v1-8k", "gpt-4", "unknown-model"])
+def test_long_article_reserves_room_for_full_translation(monkeypatch, model):
+    processor = make_processor(monkeypatch, model)
+    prompt, max_tokens, *_ = processor._build_prompt(
+        {'title': "t", 'content': article(18000), 'category': "c", 'url': "u"}
+    )
+    content = kept_content(prompt)
+
+    assert max_tokens >= 2000
+    assert max_tokens >= processor._translation_tokens(len(content))
+    assert max_tokens <= processor.max_output_tokens
+    assert processor.token_estimator.count(prompt) + max_tokens <= processor.context_budget
+
+
+def test_short_article_does_not_reserve_full_budget(monkeypatch):
+    processor = make_processor(monkeypatch, "deepseek-chat")
+    prompt, max_tokens, *_ = processor._build_prompt(
+        {'title': "t", 'content': article(500), 'category': "c", 'url': "u"}
+    )
+    assert kept_content(prompt) == article(500).strip()
+    assert processor.min_output_tokens <= max_tokens < 2000
+
+
+def test_budget_covers_every_endpoint(monkeypatch):
+    monkeypatch.setattr(config, "LLM_ENDPOINTS", [
+        {'name': "primary", 'base_url': "http://127.0.0.1:9", 'api_key': "k", 'model': "deepseek-chat"},
+        {'name': "fallback", 'base_url': "http://127.0.0.1:9", 'api_key': "k", 'model': "gpt-4",
+         'context_budget': 4000},
+    ])
+    monkeypatch.setattr(config, "ENABLE_LLM_CACHE", False)
+    processor = AIProcessor()
+    fallback = TokenEstimator("gpt-4")
+    prompt, max_tokens, *_ = processor._build_prompt(
+        {'title': "标题", 'content': article(18000), 'category': "c", 'url': "u"}
+    )
+
+    assert processor.context_budget == 4000
+    assert processor.token_estimator.count(prompt) >= fallback.count(prompt)
+    assert processor.token_estimator.count(prompt) >= TokenEstimator("deepseek-chat").count(prompt)
+    assert fallback.count(prompt) + max_tokens <= 4000
@@ -0,0 +1,113 @@
+"""
+Token估算模块
+离线估算文本的token数，按模型系列选择估算方法，用于按上下文预算截断输入和设置max_tokens
+"""
+
+import re
+from typing import Callable, List, Sequence, Tuple, Union
+
+# 中日韩字符（含全角标点）
+_CJK_RE = re.compile(r'[\u3000-\u303f\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uff00-\uffef]')
+
+Estimator = Callable[[str], int]
+
+
+def heuristic_estimator(chars_per_token: float, tokens_per_cjk: float) -> Estimator:
+    """
+    生成基于字符统计的估算函数
+
+    Args:
+        chars_per_token: 非中日韩文本平均每个token的字符数
+        tokens_per_cjk: 每个中日韩字符平均占用的token数
+    """
+    def estimate(text: str) -> int:
+        if not text:
+            return 0
+        cjk = len(_CJK_RE.findall(text))
+        return int(cjk * tokens_per_cjk + (len(text) - cjk) / chars_per_token) + 1
+    return estimate
+
+
+# 按模型名称匹配的估算函数，靠前的优先匹配（更具体的名称放在前面）
+_ESTIMATORS: List[Tuple[str, Estimator]] = [
+    ('gpt-4o', heuristic_estimator(4.2, 0.8)),
+    ('gpt-4.1', heuristic_estimator(4.2, 0.8)),
+    ('o1', heuristic_estimator(4.2, 0.8)),
+    ('o3', heuristic_estimator(4.2, 0.8)),
+    ('gpt-', heuristic_estimator(4.0, 1.2)),
+    ('claude', heuristic_estimator(3.5, 1.3)),
+    ('qwen', heuristic_estimator(4.0, 0.7)),
+    ('deepseek', heuristic_estimator(4.0, 0.6)),
+    ('glm', heuristic_estimator(4.0, 0.7)),
+    ('moonshot', heuristic_estimator(4.0, 0.7)),
+]
+
+# 未知模型使用偏保守（偏多）的估算
+_DEFAULT_ESTIMATOR = heuristic_estimator(3.5, 1.2)
+
+
+def register_estimator(pattern: str, estimator: Estimator) -> None:
+    """
+    注册模型系列的估算函数（如基于tokenizer的精确计数），优先于内置规则
+
+    Args:
+        pattern: 模型名称中包含的字符串（不区分大小写）
+        estimator: 输入文本、返回token数的函数
+    """
+    _ESTIMATORS.insert(0, (pattern.lower(), estimator))
+
+
+def get_estimator(model_name: str) -> Estimator:
+    name = (model_name or '').lower()
+    for pattern, estimator in _ESTIMATORS:
+        if pattern in name:
+            return estimator
+    return _DEFAULT_ESTIMATOR
+
+
+class TokenEstimator:
+    """
+    按模型估算token数并按token预算截断文本
+
+    传入多个模型时取各模型估算结果中的最大值（请求可能发往其中任意一个模型）
+    """
+
+    def __init__(self, model_name: Union[str, Sequence[str]]):
+        model_names = [model_name] if isinstance(model_name, str) else list(model_name)
+        self.model_name = model_names[0] if model_names else ''
+        estimators = list(dict.fromkeys(get_estimator(name) for name in model_names)) or [_DEFAULT_ESTIMATOR]
+        if len(estimators) == 1:
+            self._estimate = estimators[0]
+        else:
+            self._estimate = lambda text: max(estimate(text) for estimate in estimators)
+
+    def count(self, text: str) -> int:
+        return self._estimate(text)
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """
+        截断文本使其不超过max_tokens，尽量在句子或单词边界处截断
+        """
+        if max_tokens <= 0:
+            return ''
+        if self.count(text) <= max_tokens:
+            return text
+
+        # 二分查找不超过预算的最长前缀
+        low, high = 0, len(text)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self.count(text[:middle]) <= max_tokens:
+                low = middle
+            else:
+                high = middle - 1
+        cut = text[:low]
+
+        # 截断点附近有句末标点或空白时，退回到该位置
+        boundary = max(cut.rfind(mark) for mark in ('. ', '。', '! ', '? ', '\n'))
+        if boundary >= len(cut) * 0.8:
+            return cut[:boundary + 1]
+        space = cut.rfind(' ')
+        if space >= len(cut) * 0.9:
+            return cut[:space]
+        return cut
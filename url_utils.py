@@ -0,0 +1,65 @@
+"""
+URL工具模块
+提供URL规范化，用于缓存键和去重
+"""
+
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# 常见的跟踪参数（精确匹配）
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'mc_cid', 'mc_eid', 'igshid',
+    'ocid', 'cmpid', 'ref_src', 'xtor', 'spm',
+}
+
+# 跟踪参数前缀（utm_*、BBC的at_*、ns_*）
+TRACKING_PREFIXES = ('utm_', 'at_', 'ns_')
+
+
+def _is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    规范化URL：协议统一为https、主机转小写、去掉默认端口和片段、
+    移除跟踪参数并对剩余查询参数排序、去掉路径末尾斜杠
+
+    Args:
+        url: 原始URL
+
+    Returns:
+        规范化后的URL，无法解析时原样返回
+    """
+    if not url:
+        return ""
+
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        return url
+
+    scheme = (parts.scheme or 'http').lower()
+    if scheme == 'http':
+        scheme = 'https'
+
+    host = (parts.hostname or '').lower()
+    if not host:
+        return url
+    if port in (80, 443):
+        port = None
+    netloc = f"{host}:{port}" if port else host
+
+    path = parts.path or '/'
+    if len(path) > 1:
+        path = path.rstrip('/')
+
+    query_pairs = [
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking_param(key)
+    ]
+    query = urlencode(sorted(query_pairs))
+
+    return urlunsplit((scheme, netloc, path, query, ''))